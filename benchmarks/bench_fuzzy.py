@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import random
+import difflib
+import argparse
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers import SearchIndex
+
+WORDS = (
+    "love night dream fire heart rain summer river shadow light road city "
+    "blue golden broken wild silent electric midnight morning ocean winter "
+    "angel ghost thunder paradise memory stranger freedom desire echo horizon"
+).split()
+
+def make_names(count, seed):
+    rnd = random.Random(seed)
+    names = []
+    for i in range(count):
+        artist = " ".join(rnd.choice(WORDS).title() for _ in range(rnd.randint(1, 2)))
+        title = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 4)))
+        names.append(f"{artist} - {title} {i}")
+    return names
+
+def make_typo(text, rnd):
+    chars = list(text)
+    pos = rnd.randrange(1, len(chars) - 1)
+    kind = rnd.choice(("swap", "drop", "replace"))
+    if kind == "swap":
+        chars[pos], chars[pos + 1] = chars[pos + 1], chars[pos]
+    elif kind == "drop":
+        del chars[pos]
+    else:
+        chars[pos] = rnd.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+def make_queries(names, count, seed):
+    rnd = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        target = rnd.randrange(len(names))
+        title = names[target].split(" - ", 1)[1]
+        if len(title) < 8:
+            continue
+        queries.append((make_typo(title.lower(), rnd), target))
+    return queries
+
+def difflib_fuzzy(names, index, query, matched):
+    taken = set(matched)
+    candidates = [i for i in range(len(names)) if i not in taken]
+    cand_names = [names[i] for i in candidates]
+    matches = set(difflib.get_close_matches(query, cand_names, n=len(cand_names), cutoff=0.5))
+    return [i for i, nm in zip(candidates, cand_names) if nm in matches]
+
+def trigram_fuzzy(index, query, matched):
+    return index.fuzzy(query, matched)
+
+def run(engine, index, queries):
+    timings = []
+    hits = 0
+    sizes = 0
+    for query, target in queries:
+        start = time.perf_counter()
+        matched = index.match(query)
+        result = engine(index, query, matched)
+        timings.append(time.perf_counter() - start)
+        hits += target in result or target in matched
+        sizes += len(result)
+    timings.sort()
+    return {
+        "p50_ms": timings[len(timings) // 2] * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1000,
+        "recall": hits / len(queries),
+        "avg_results": sizes / len(queries),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the trigram fuzzy matcher with difflib")
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    names = make_names(args.tracks, args.seed)
+    queries = make_queries(names, args.queries, args.seed + 1)
+    
+    start = time.perf_counter()
+    index = SearchIndex(names)
+    build = time.perf_counter() - start
+    
+    print(f"{args.tracks} tracks, {args.queries} typo queries, index build {build * 1000:.0f} ms")
+    print(f"{'engine':<10} {'p50 ms':>10} {'p95 ms':>10} {'recall':>8} {'results':>9}")
+    for label, engine in (("difflib", partial(difflib_fuzzy, names)), ("trigram", trigram_fuzzy)):
+        r = run(engine, index, queries)
+        print(f"{label:<10} {r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f} {r['recall']:>8.2f} {r['avg_results']:>9.1f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import (
+    LibraryScan, walk_music_files, scan_songs, build_library, find_changes, apply_changes, DEFAULT_SCAN_WORKERS
+)
+from catalog import Catalog
+from store import open_store
+from helpers import SearchIndex
+from synthlib import make_library
+from bench_fuzzy import make_typo
+
+TOUCH_FRACTION = 0.01
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "min": samples[0],
+        "median": samples[len(samples) // 2],
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max": samples[-1],
+    }
+
+def cold_scan(root, store, workers):
+    timings = {}
+    
+    def save(results):
+        start = time.perf_counter()
+        playlist, library = build_library(results, root)
+        store.save(playlist, library, Catalog.build(playlist, library))
+        timings["save_s"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    scan = LibraryScan(root, workers, on_complete=save)
+    scan.start()
+    scan.join()
+    timings["cold_scan_s"] = time.perf_counter() - start
+    timings["files"] = scan.scanned
+    return timings
+
+def warm_load(root, cache_dir, backend, repeat):
+    samples = []
+    store = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        store = open_store(cache_dir, root, backend)
+        playlist, library = store.load()
+        samples.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    catalog = store.load_catalog(library)
+    return summarize(samples), time.perf_counter() - start, (playlist, library, catalog)
+
+def refresh(root, store, loaded, workers):
+    playlist, library, catalog = loaded
+    start = time.perf_counter()
+    files = {song: (size, mtime) for song, size, mtime in walk_music_files(root)}
+    changed, removed = find_changes(library, files)
+    scanned = list(scan_songs(((song,) + files[song] for song in changed), workers))
+    playlist = apply_changes(library, catalog, playlist, scanned, removed)[0]
+    if changed or removed:
+        store.update(playlist, library, catalog, changed, removed)
+    return time.perf_counter() - start, len(changed), (playlist, library, catalog)
+
+def touch(root, fraction, seed):
+    paths = [path for path, size, mtime in walk_music_files(root)]
+    rnd = random.Random(seed)
+    chosen = rnd.sample(paths, max(1, int(len(paths) * fraction)))
+    now = time.time()
+    for path in chosen:
+        os.utime(path, (now, now))
+    return len(chosen)
+
+def keystrokes(names, count, seed):
+    rnd = random.Random(seed)
+    queries = []
+    for i in range(count):
+        title = names[rnd.randrange(len(names))].split(" - ", 1)[-1].lower()
+        if i % 2 and len(title) > 8:
+            title = make_typo(title, rnd)
+        queries.append(title[:rnd.randint(4, max(4, len(title)))])
+    return queries
+
+def type_query(index, query):
+    samples = []
+    matched = None
+    for end in range(1, len(query) + 1):
+        typed = query[:end]
+        start = time.perf_counter()
+        if typed.strip():
+            matched = index.match(typed, matched)
+            index.fuzzy(typed, matched)
+        else:
+            matched = None
+            index.search(typed)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def search(library, playlist, queries, seed):
+    names = [library.name(track) for track in playlist]
+    start = time.perf_counter()
+    index = SearchIndex(names)
+    build = time.perf_counter() - start
+    
+    samples = []
+    for query in keystrokes(names, queries, seed):
+        samples.extend(sample * 1000 for sample in type_query(index, query))
+    return build * 1000, summarize(samples), len(samples)
+
+def run(tracks, args):
+    root = os.path.join(args.libraries, f"synth_{tracks}_{args.seed}")
+    start = time.perf_counter()
+    make_library(root, tracks, args.seed)
+    generated = time.perf_counter() - start
+    
+    cache_dir = Path(tempfile.mkdtemp(prefix="wmus-bench-"))
+    try:
+        store = open_store(cache_dir, root, args.backend)
+        result = {"tracks": tracks, "generate_s": generated}
+        result.update(cold_scan(root, store, args.workers))
+        result["warm_load_s"], result["catalog_load_s"], loaded = warm_load(root, cache_dir, args.backend, args.repeat)
+        
+        samples = []
+        for _ in range(args.repeat):
+            elapsed, changed, loaded = refresh(root, store, loaded, args.workers)
+            samples.append(elapsed)
+        result["refresh_unchanged_s"] = summarize(samples)
+        
+        samples = []
+        for i in range(args.repeat):
+            result["touched"] = touch(root, TOUCH_FRACTION, args.seed + i)
+            elapsed, changed, loaded = refresh(root, store, loaded, args.workers)
+            samples.append(elapsed)
+        result["refresh_touched_s"] = summarize(samples)
+        
+        playlist, library, catalog = loaded
+        build, keystroke, count = search(library, playlist, args.queries, args.seed)
+        result["search_index_build_ms"] = build
+        result["keystroke_ms"] = keystroke
+        result["keystrokes"] = count
+        return result
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+def print_table(report):
+    print(f"backend {report['backend']}, {report['workers']} workers, python {report['python']}")
+    print(
+        f"{'tracks':>8} {'scan s':>8} {'save s':>8} {'load ms':>9} {'refresh ms':>11} "
+        f"{'touched ms':>11} {'key p50':>8} {'key p95':>8}"
+    )
+    for r in report["results"]:
+        print(
+            f"{r['tracks']:>8} {r['cold_scan_s']:>8.2f} {r['save_s']:>8.2f} "
+            f"{r['warm_load_s']['median'] * 1000:>9.1f} {r['refresh_unchanged_s']['median'] * 1000:>11.1f} "
+            f"{r['refresh_touched_s']['median'] * 1000:>11.1f} "
+            f"{r['keystroke_ms']['median']:>8.2f} {r['keystroke_ms']['p95']:>8.2f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Time library scan, cache load, refresh and search")
+    parser.add_argument("--tracks", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--libraries", default=os.path.join(tempfile.gettempdir(), "wmus-synthlib"))
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--workers", type=int, default=DEFAULT_SCAN_WORKERS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+    
+    report = {
+        "suite": "library",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "backend": args.backend,
+        "workers": args.workers,
+        "seed": args.seed,
+        "results": [run(tracks, args) for tracks in args.tracks],
+    }
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
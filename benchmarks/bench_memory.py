@@ -0,0 +1,72 @@
+import os
+import sys
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import SongCache, build_library
+from catalog import Catalog
+from bench_fuzzy import WORDS
+
+MUSIC_ROOT = os.path.join(os.path.expanduser("~"), "Music")
+
+def make_songs(count, seed):
+    rnd = random.Random(seed)
+    artists = [" ".join(rnd.choice(WORDS).title() for _ in range(2)) for _ in range(max(1, count // 200))]
+    albums = [(rnd.choice(artists), " ".join(rnd.choice(WORDS).title() for _ in range(3))) for _ in range(max(1, count // 12))]
+    songs = []
+    for i in range(count):
+        artist, album = rnd.choice(albums)
+        title = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 4)))
+        path = os.path.join(MUSIC_ROOT, artist, album, f"{i % 20 + 1:02d} {title}.flac")
+        duration = rnd.randint(90, 420)
+        # round trip forces un-interned copies, as tags read per file are, to compare with the table's interned strings
+        tags = album.encode().decode(), artist.encode().decode()
+        songs.append((path, f"{artist} - {title}", duration) + tags + (rnd.randint(2 << 20, 60 << 20),))
+    return songs
+
+def old_layout(songs):
+    song_cache = {}
+    for path, name, duration, album, artist, size in songs:
+        minutes, seconds = divmod(duration, 60)
+        song_cache[path] = SongCache(name, duration, f"{minutes:02}:{seconds:02}", album, artist, size, 1700000000000000000 + size)
+    playlist = sorted(song_cache)
+    albums = {}
+    for path in playlist:
+        albums.setdefault(song_cache[path].album, []).append(path)
+    return playlist, song_cache, albums
+
+def new_layout(songs):
+    results = {}
+    for path, name, duration, album, artist, size in songs:
+        minutes, seconds = divmod(duration, 60)
+        results[path] = SongCache(name, duration, f"{minutes:02}:{seconds:02}", album, artist, size, 1700000000000000000 + size)
+    playlist, library = build_library(results, MUSIC_ROOT)
+    del results
+    return playlist, library, Catalog.build(playlist, library)
+
+def measure(build, count, seed):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    layout = build(make_songs(count, seed))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del layout
+    return current - before, peak - before
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare library memory use of the dict layout with the track table")
+    parser.add_argument("--tracks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    print(f"{args.tracks} tracks")
+    print(f"{'layout':<10} {'retained MB':>12} {'peak MB':>10} {'bytes/track':>12}")
+    for label, build in (("dict", old_layout), ("table", new_layout)):
+        retained, peak = measure(build, args.tracks, args.seed)
+        print(f"{label:<10} {retained / 1048576:>12.1f} {peak / 1048576:>10.1f} {retained / args.tracks:>12.0f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
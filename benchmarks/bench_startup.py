@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VERSION_TARGET_MS = 50
+IMPORT_TARGET_MS = 150
+LAZY_MODULES = ("pygame", "mutagen")
+
+IMPORT_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, ' '.join(name for name in {lazy!r} if name in sys.modules))\n"
+)
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "min": samples[0],
+        "median": samples[len(samples) // 2],
+        "max": samples[-1],
+    }
+
+def environment():
+    env = dict(os.environ)
+    env.setdefault("LOCALAPPDATA", tempfile.gettempdir())
+    env["SDL_AUDIODRIVER"] = "dummy"
+    return env
+
+def time_command(args, repeat, env):
+    samples = []
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable] + args, cwd=ROOT, env=env, capture_output=True, text=True)
+        samples.append((time.perf_counter() - start) * 1000)
+        if result.returncode:
+            sys.exit(f"{' '.join(args)} failed:\n{result.stderr}")
+        output = result.stdout.strip()
+    return summarize(samples), output
+
+def time_import(repeat, env):
+    samples = []
+    loaded = set()
+    probe = IMPORT_PROBE.format(lazy=LAZY_MODULES)
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True, text=True)
+        if result.returncode:
+            sys.exit(f"import main failed:\n{result.stderr}")
+        elapsed, *modules = result.stdout.split()
+        samples.append(float(elapsed) * 1000)
+        loaded.update(modules)
+    return summarize(samples), sorted(loaded)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time wmus startup and check it against the targets")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+    
+    env = environment()
+    interpreter, _ = time_command(["-c", "pass"], args.repeat, env)
+    version, output = time_command(["main.py", "--version"], args.repeat, env)
+    imported, loaded = time_import(args.repeat, env)
+    
+    version_overhead = version["median"] - interpreter["median"]
+    checks = {
+        "version": version_overhead <= VERSION_TARGET_MS,
+        "import": imported["median"] <= IMPORT_TARGET_MS,
+        "lazy_modules": not loaded,
+    }
+    report = {
+        "suite": "startup",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "version_output": output,
+        "interpreter_ms": interpreter,
+        "version_ms": version,
+        "version_overhead_ms": version_overhead,
+        "import_main_ms": imported,
+        "loaded_on_import": loaded,
+        "targets": {"version_overhead_ms": VERSION_TARGET_MS, "import_main_ms": IMPORT_TARGET_MS},
+        "passed": checks,
+    }
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"python {report['python']}, {args.repeat} runs, medians")
+        print(f"{'interpreter':<14} {interpreter['median']:>8.1f} ms")
+        print(f"{'--version':<14} {version['median']:>8.1f} ms  +{version_overhead:.1f} ms (target {VERSION_TARGET_MS})")
+        print(f"{'import main':<14} {imported['median']:>8.1f} ms  (target {IMPORT_TARGET_MS})")
+        print(f"{'lazy modules':<14} {', '.join(loaded) + ' loaded on import' if loaded else 'not loaded'}")
+    
+    if not all(checks.values()):
+        failed = ", ".join(name for name, ok in checks.items() if not ok)
+        sys.exit(f"startup targets missed: {failed}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
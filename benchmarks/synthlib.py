@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import random
+import shutil
+import struct
+import argparse
+
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3, TIT2, TPE1, TALB
+from mutagen.ogg import OggPage
+from mutagen.oggvorbis import OggVorbis
+from mutagen._vorbis import VComment
+
+from bench_fuzzy import WORDS
+
+FORMATS = ("mp3", "flac", "ogg")
+SAMPLE_RATE = 44100
+MARKER = ".wmus-synthlib"
+
+MP3_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+MP3_FRAME_SIZE = 417
+
+def flac_bytes(seconds):
+    bits = (SAMPLE_RATE << 44) | (1 << 41) | (15 << 36) | (seconds * SAMPLE_RATE)
+    info = struct.pack(">HH", 4096, 4096) + b"\0" * 6 + bits.to_bytes(8, "big") + b"\0" * 16
+    return b"fLaC" + bytes([0x80, 0, 0, 34]) + info
+
+def mp3_bytes(seconds):
+    frames = seconds * SAMPLE_RATE // 1152
+    xing = MP3_HEADER + b"\0" * 32 + b"Xing" + struct.pack(">II", 1, frames)
+    frame = MP3_HEADER + b"\0" * (MP3_FRAME_SIZE - len(MP3_HEADER))
+    return xing.ljust(MP3_FRAME_SIZE, b"\0") + frame * 3
+
+def ogg_bytes(seconds):
+    ident = b"\x01vorbis" + struct.pack("<IBIiiiBB", 0, 2, SAMPLE_RATE, 0, 128000, 0, 0xB8, 1)
+    headers = [b"\x03vorbis" + VComment().write(), b"\x05vorbis" + b"\0" * 16]
+    pages = []
+    for sequence, packets in enumerate(([ident], headers, [b"\0" * 32])):
+        page = OggPage()
+        page.serial = 1
+        page.sequence = sequence
+        page.packets = packets
+        pages.append(page)
+    pages[0].first = True
+    pages[-1].last = True
+    pages[-1].position = seconds * SAMPLE_RATE
+    return b"".join(page.write() for page in pages)
+
+def write_track(path, fmt, seconds, title, artist, album):
+    if fmt == "mp3":
+        with open(path, "wb") as f:
+            f.write(mp3_bytes(seconds))
+        tags = ID3()
+        tags.add(TIT2(encoding=3, text=title))
+        tags.add(TPE1(encoding=3, text=artist))
+        tags.add(TALB(encoding=3, text=album))
+        tags.save(path)
+        return
+    
+    with open(path, "wb") as f:
+        f.write(flac_bytes(seconds) if fmt == "flac" else ogg_bytes(seconds))
+    audio = FLAC(path) if fmt == "flac" else OggVorbis(path)
+    audio["title"] = title
+    audio["artist"] = artist
+    audio["album"] = album
+    audio.save()
+
+def make_library(root, count, seed=1, formats=FORMATS):
+    marker = os.path.join(root, MARKER)
+    spec = {"tracks": count, "seed": seed, "formats": list(formats)}
+    try:
+        with open(marker, "r", encoding="utf-8") as f:
+            if json.load(f) == spec:
+                return False
+        shutil.rmtree(root)
+    except (OSError, ValueError):
+        pass
+    
+    rnd = random.Random(seed)
+    artists = [" ".join(rnd.choice(WORDS).title() for _ in range(2)) + f" {i}" for i in range(max(1, count // 120))]
+    track = 0
+    while track < count:
+        artist = rnd.choice(artists)
+        album = " ".join(rnd.choice(WORDS).title() for _ in range(rnd.randint(1, 3)))
+        directory = os.path.join(root, artist, f"{album} ({track})")
+        os.makedirs(directory, exist_ok=True)
+        for number in range(1, min(rnd.randint(8, 16), count - track) + 1):
+            title = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(2, 4))).capitalize()
+            fmt = formats[track % len(formats)]
+            path = os.path.join(directory, f"{number:02d} {title}.{fmt}")
+            write_track(path, fmt, rnd.randint(90, 420), title, artist, album)
+            track += 1
+    
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump(spec, f)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic tagged music library for benchmarks")
+    parser.add_argument("root")
+    parser.add_argument("--tracks", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    args = parser.parse_args()
+    
+    formats = tuple(fmt for fmt in args.formats.split(",") if fmt in FORMATS)
+    if not formats:
+        sys.exit(f"formats must be a subset of {','.join(FORMATS)}")
+    
+    if make_library(args.root, args.tracks, args.seed, formats):
+        print(f"Wrote {args.tracks} tracks to {args.root}")
+    else:
+        print(f"{args.root} already holds {args.tracks} tracks for seed {args.seed}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,144 @@
+import sys
+
+class Catalog:
+    __slots__ = (
+        'library', 'albums', 'album_keys', 'artists', 'version',
+        '_album_ids', '_album_order', '_artist_order', '_artist_tracks', '_unsorted'
+    )
+    
+    def __init__(self, library):
+        self.library = library
+        self.albums = []
+        self.album_keys = []
+        self.artists = {}
+        self.version = 0
+        self._album_ids = {}
+        self._album_order = None
+        self._artist_order = None
+        self._artist_tracks = None
+        self._unsorted = set()
+    
+    @classmethod
+    def build(cls, playlist, library):
+        catalog = cls(library)
+        for track in playlist:
+            catalog.add(track)
+        return catalog
+    
+    def album_id(self, artist, title):
+        key = (artist, title)
+        aid = self._album_ids.get(key)
+        if aid is None:
+            aid = len(self.albums)
+            self.albums.append([])
+            self.album_keys.append(key)
+            self._album_ids[key] = aid
+        return aid
+    
+    def set_album(self, aid, tracks):
+        if not self.albums[aid] and tracks:
+            self._attach(aid)
+        self.albums[aid] = tracks
+        self.version += 1
+    
+    def _track_album(self, track):
+        library = self.library
+        return self._album_ids.get((library.album_artist_id(track), library.album_ids[track]))
+    
+    def _attach(self, aid):
+        artist = self.album_keys[aid][0]
+        albums = self.artists.get(artist)
+        if albums is None:
+            self.artists[artist] = [aid]
+            self._artist_order = None
+        else:
+            albums.append(aid)
+            self._unsorted.add(artist)
+        self._album_order = None
+    
+    def _detach(self, aid):
+        artist = self.album_keys[aid][0]
+        albums = self.artists[artist]
+        albums.remove(aid)
+        if not albums:
+            del self.artists[artist]
+            self._unsorted.discard(artist)
+            self._artist_order = None
+        self._album_order = None
+    
+    def add(self, track):
+        library = self.library
+        aid = self.album_id(library.album_artist_id(track), library.album_ids[track])
+        tracks = self.albums[aid]
+        if not tracks:
+            self._attach(aid)
+        tracks.append(track)
+        if len(tracks) > 1 and library.path(tracks[-2]) > library.path(track):
+            tracks.sort(key=library.path)
+        self.version += 1
+        return aid
+    
+    def remove(self, track):
+        aid = self._track_album(track)
+        if aid is None:
+            return
+        tracks = self.albums[aid]
+        if track in tracks:
+            tracks.remove(track)
+            if not tracks:
+                self._detach(aid)
+            self.version += 1
+    
+    def footprint(self):
+        size = sys.getsizeof(self.albums) + sum(map(sys.getsizeof, self.albums))
+        size += sys.getsizeof(self.album_keys) + sum(map(sys.getsizeof, self.album_keys))
+        size += sys.getsizeof(self.artists) + sum(map(sys.getsizeof, self.artists.values()))
+        return size + sys.getsizeof(self._album_ids)
+    
+    def album_title(self, aid):
+        return self.library.strings[self.album_keys[aid][1]]
+    
+    def album_artist(self, aid):
+        return self.library.strings[self.album_keys[aid][0]]
+    
+    def album_label(self, aid):
+        artist = self.album_artist(aid)
+        title = self.album_title(aid)
+        return f"{title} - {artist}" if artist else title
+    
+    def album_order(self):
+        if self._album_order is None:
+            strings = self.library.strings
+            keys = self.album_keys
+            self._album_order = sorted(
+                (aid for aid in range(len(keys)) if keys[aid][1] and self.albums[aid]),
+                key=lambda aid: (strings[keys[aid][1]], strings[keys[aid][0]])
+            )
+        return self._album_order
+    
+    def artist_order(self):
+        if self._artist_order is None:
+            strings = self.library.strings
+            self._artist_order = sorted((sid for sid in self.artists if sid), key=strings.__getitem__)
+        return self._artist_order
+    
+    def artist_name(self, sid):
+        return self.library.strings[sid]
+    
+    def artist_track_count(self, sid):
+        return sum(len(self.albums[aid]) for aid in self.artists.get(sid, ()))
+    
+    def artist_tracks(self, sid):
+        cached = self._artist_tracks
+        if cached is not None and cached[0] == sid and cached[1] == self.version:
+            return cached[2]
+        
+        if sid in self._unsorted:
+            self._unsorted.discard(sid)
+            self.artists[sid].sort(key=self.album_title)
+        
+        tracks = []
+        for aid in self.artists.get(sid, ()):
+            tracks.extend(self.albums[aid])
+        self._artist_tracks = (sid, self.version, tracks)
+        return tracks
\ No newline at end of file
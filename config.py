@@ -1,9 +1,9 @@
 import os
+import sys
 import json
 from pathlib import Path
 
 CONFIG_DIR = Path(os.getenv('LOCALAPPDATA')) / 'wmus' / 'config'
-CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 DEFAULT_CONFIG = {
     "keybindings": {
@@ -29,7 +29,13 @@ DEFAULT_CONFIG = {
     "shuffle": False,
     "repeat": False,
     "volume": 1.0,
-    "default_view": 1
+    "default_view": 1,
+    "scan_workers": 4,
+    "library_backend": "json",
+    "watch_interval": 2.0,
+    "prefetch_mb": 8,
+    "remote_control": sys.platform != "win32",
+    "remote_address": ""
 }
 
 def load_config(path=None):
@@ -68,6 +74,7 @@ def save_config(config, path=None):
         path = CONFIG_DIR / "config.json"
     else:
         path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
     
     config_to_save = config.copy()
     
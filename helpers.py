@@ -1,6 +1,16 @@
 import curses
-import difflib
 import hashlib
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import chain
+
+FUZZY_LIMIT = 50
+FUZZY_CUTOFF = 0.4
+FUZZY_BUDGET = 200000
+WORDS_MERGE_RATIO = 4
+COMPACT_MIN = 1024
 
 def key_match(key, options, buffer=None):
     for opt in options:
@@ -18,43 +28,214 @@ def key_match(key, options, buffer=None):
                 return True
     return False
 
-def search(query, names):
-    if not query or not query.strip():
-        return list(range(len(names)))
+class SearchIndex:
+    __slots__ = (
+        'lowered', 'count', '_keys', '_slots', '_order', '_positions', '_blob', '_offsets',
+        '_words', '_word_slots', '_new_words', '_trigrams', '_dead'
+    )
     
-    q = query.lower()
-    exact = []
-    starts = []
-    word = []
-    substring = []
+    def __init__(self, names, keys=None):
+        self._order = None
+        self._positions = None
+        self._load(range(len(names)) if keys is None else keys, names)
     
-    for i, n in enumerate(names):
-        nl = n.lower()
-        if nl == q:
-            exact.append(i)
-        elif nl.startswith(q):
-            starts.append(i)
-        elif any(w.startswith(q) for w in nl.split()):
-            word.append(i)
-        elif q in nl:
-            substring.append(i)
+    def _load(self, keys, names):
+        self.lowered = []
+        self.count = 0
+        self._keys = []
+        self._slots = {}
+        self._blob = ""
+        self._offsets = array('i')
+        self._words = []
+        self._word_slots = []
+        self._new_words = []
+        self._trigrams = {}
+        self._dead = 0
+        self.add(zip(keys, names))
     
-    taken = set(exact + starts + word + substring)
-    if len(taken) == len(names):
-        return exact + starts + word + substring
+    def set_order(self, order, positions):
+        self._order = order
+        self._positions = positions
     
-    candidates = [i for i in range(len(names)) if i not in taken]
-    cand_names = [names[i] for i in candidates]
-    matches = difflib.get_close_matches(q, cand_names, n=len(cand_names), cutoff=0.5)
+    def add(self, entries):
+        slots = self._slots
+        keys = self._keys
+        lowered = self.lowered
+        first = len(lowered)
+        for key, name in entries:
+            old = slots.get(key)
+            if old is not None:
+                self._drop(old)
+            slots[key] = len(lowered)
+            keys.append(key)
+            lowered.append(name.lower())
+        
+        added = lowered[first:]
+        if not added:
+            return
+        self.count += len(added)
+        
+        offsets = self._offsets
+        pos = len(self._blob)
+        for nl in added:
+            offsets.append(pos)
+            pos += len(nl) + 1
+        self._blob += "\n".join(added) + "\n"
+        
+        new_words = self._new_words
+        trigrams = self._trigrams
+        for slot, nl in enumerate(added, first):
+            for w in set(nl.split()):
+                new_words.append((w, slot))
+            for gram in _trigrams(nl):
+                posting = trigrams.get(gram)
+                if posting is None:
+                    posting = trigrams[gram] = array('i')
+                posting.append(slot)
+        
+        if len(new_words) * WORDS_MERGE_RATIO > len(self._words):
+            self._merge_words()
     
-    fuzzy = []
-    if matches:
-        matches_set = set(matches)
-        for i, nm in zip(candidates, cand_names):
-            if nm in matches_set:
-                fuzzy.append(i)
+    def remove(self, keys):
+        slots = self._slots
+        for key in keys:
+            slot = slots.pop(key, None)
+            if slot is not None:
+                self._drop(slot)
+        
+        if self._dead > COMPACT_MIN and self._dead > self.count:
+            lowered = self.lowered
+            self._load(list(slots), [lowered[slot] for slot in slots.values()])
     
-    return exact + starts + word + substring + fuzzy
+    def _drop(self, slot):
+        self.lowered[slot] = None
+        self.count -= 1
+        self._dead += 1
+    
+    def _merge_words(self):
+        lowered = self.lowered
+        self._new_words.sort()
+        words = sorted(
+            (w, slot) for w, slot in chain(zip(self._words, self._word_slots), self._new_words)
+            if lowered[slot] is not None
+        )
+        self._words = [w for w, slot in words]
+        self._word_slots = [slot for w, slot in words]
+        self._new_words = []
+    
+    def _substring_hits(self, q):
+        blob = self._blob
+        offsets = self._offsets
+        lowered = self.lowered
+        hits = []
+        pos = blob.find(q)
+        while pos != -1:
+            slot = bisect_right(offsets, pos) - 1
+            if lowered[slot] is not None:
+                hits.append(slot)
+            if slot + 1 >= len(offsets):
+                break
+            pos = blob.find(q, offsets[slot + 1])
+        return hits
+    
+    def _word_prefix_hits(self, q):
+        hits = set()
+        words = self._words
+        k = bisect_left(words, q)
+        while k < len(words) and words[k].startswith(q):
+            hits.add(self._word_slots[k])
+            k += 1
+        
+        new_words = self._new_words
+        new_words.sort()
+        k = bisect_left(new_words, (q,))
+        while k < len(new_words) and new_words[k][0].startswith(q):
+            hits.add(new_words[k][1])
+            k += 1
+        return hits
+    
+    def match(self, query, within=None):
+        q = query.lower()
+        lowered = self.lowered
+        
+        if within is None:
+            hits = self._substring_hits(q)
+        else:
+            order = self._order
+            slots = self._slots
+            hits = []
+            for pos in within:
+                slot = slots.get(order[pos] if order is not None else pos)
+                if slot is not None and q in lowered[slot]:
+                    hits.append(slot)
+        
+        word_hits = self._word_prefix_hits(q)
+        keys = self._keys
+        positions = self._positions
+        exact = []
+        starts = []
+        word = []
+        substring = []
+        for slot in hits:
+            pos = keys[slot] if positions is None else positions[keys[slot]]
+            if pos < 0:
+                continue
+            nl = lowered[slot]
+            if nl == q:
+                exact.append(pos)
+            elif nl.startswith(q):
+                starts.append(pos)
+            elif slot in word_hits:
+                word.append(pos)
+            else:
+                substring.append(pos)
+        
+        return sorted(exact) + sorted(starts) + sorted(word) + sorted(substring)
+    
+    def fuzzy(self, query, matched, limit=FUZZY_LIMIT, cutoff=FUZZY_CUTOFF):
+        grams = _trigrams(query.lower())
+        if not grams:
+            return []
+        
+        trigrams = self._trigrams
+        postings = sorted((trigrams[g] for g in grams if g in trigrams), key=len)
+        counts = Counter()
+        budget = FUZZY_BUDGET
+        for posting in postings:
+            if len(posting) > budget:
+                break
+            counts.update(posting)
+            budget -= len(posting)
+        
+        needed = cutoff * len(grams)
+        taken = set(matched)
+        lowered = self.lowered
+        keys = self._keys
+        positions = self._positions
+        candidates = []
+        for slot, count in counts.items():
+            if count < needed or lowered[slot] is None:
+                continue
+            pos = keys[slot] if positions is None else positions[keys[slot]]
+            if pos >= 0 and pos not in taken:
+                candidates.append((count, -len(lowered[slot]), -pos))
+        return [-pos for count, length, pos in heapq.nlargest(limit, candidates)]
+    
+    def search(self, query):
+        if not query or not query.strip():
+            return list(range(len(self._order) if self._order is not None else self.count))
+        
+        matched = self.match(query)
+        return matched + self.fuzzy(query, matched)
+
+def _trigrams(text):
+    padded = f" {' '.join(text.split())} "
+    if len(padded) < 3:
+        return set()
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def search(query, names):
+    return SearchIndex(names).search(query)
 
 def get_folder_hash(path):
     return hashlib.md5(path.encode("utf-8")).hexdigest()
@@ -93,7 +274,11 @@ _HELP_COMMANDS = (
     "=" * 60,
     ":add <folder>     Set or change music library folder",
     ":a <folder>       (alias for :add)",
-    ":refresh          Rescan library and rebuild cache",
+    ":refresh          Rescan library for added, changed or removed files",
+    ":cancel           Stop a library scan that is in progress",
+    ":info             Show format and tag details of the playing track",
+    ":wakeups          Toggle the main loop wakeups-per-second meter",
+    ":stats            Toggle the performance overlay",
     ":clear            Clear the playback queue",
     ":c                (alias for :clear)",
     ":remove <n>       Remove track #n from queue",
@@ -109,13 +294,14 @@ _HELP_COMMANDS = (
     "Press 1           Library view (all tracks)",
     "Press 2           Album view (organized by album)",
     "Press 3           Queue view (upcoming tracks)",
+    "Press 4           Artist view (organized by artist)",
     "",
     "=" * 60,
-    "ALBUM VIEW:",
+    "ALBUM AND ARTIST VIEWS:",
     "=" * 60,
     "* Use Left/Right, h/l, or Tab to switch columns",
-    "* Press Enter on album to view songs",
-    "* Press 'e' on album to queue entire album",
+    "* Press Enter on album or artist to view songs",
+    "* Press 'e' on album or artist to queue all of its songs",
     "* Press 'e' on song to queue individual track",
     "",
     "=" * 60,
@@ -0,0 +1,481 @@
+import os
+import sys
+import time
+import queue
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_SCAN_WORKERS = 4
+SCAN_PUBLISH_INTERVAL = 0.25
+UNKNOWN_DURATION = -1
+
+MUSIC_EXTENSIONS = frozenset(
+    os.path.normcase(ext) for ext in (
+        '.mp3', '.wav', '.flac', '.ogg', '.aac', '.m4a', '.wma',
+        '.opus', '.ape', '.wv', '.tta'
+    )
+)
+
+class SongCache:
+    __slots__ = ('name', 'duration', 'timestamp', 'album', 'artist', 'size', 'mtime', 'album_artist')
+    
+    def __init__(self, name, duration, timestamp, album, artist="", size=0, mtime=0, album_artist=""):
+        self.name = name
+        self.duration = duration
+        self.timestamp = timestamp
+        self.album = album
+        self.artist = artist
+        self.size = size
+        self.mtime = mtime
+        self.album_artist = album_artist
+
+def format_duration(duration):
+    if duration < 0:
+        return "--:--"
+    minutes = duration // 60
+    seconds = duration % 60
+    return f"{minutes:02}:{seconds:02}"
+
+class LibraryTable:
+    __slots__ = (
+        'root', 'dirs', 'dir_ids', 'files', 'names', 'durations', 'sizes', 'mtimes',
+        'album_ids', 'artist_ids', 'album_artist_ids', 'alive', 'strings', 'count',
+        '_prefix', '_prefixes', '_dir_index', '_dir_files', '_dead', '_string_ids'
+    )
+    
+    def __init__(self, root=""):
+        self.root = root
+        self.dirs = []
+        self.dir_ids = array('i')
+        self.files = []
+        self.names = []
+        self.durations = array('i')
+        self.sizes = array('q')
+        self.mtimes = array('q')
+        self.album_ids = array('i')
+        self.artist_ids = array('i')
+        self.album_artist_ids = array('i')
+        self.alive = bytearray()
+        self.strings = [""]
+        self.count = 0
+        self._prefix = root if not root or root.endswith(os.sep) else root + os.sep
+        self._prefixes = []
+        self._dir_index = {}
+        self._dir_files = []
+        self._dead = {}
+        self._string_ids = {"": 0}
+    
+    def __len__(self):
+        return self.count
+    
+    def __contains__(self, track):
+        return track is not None and 0 <= track < len(self.alive) and self.alive[track] == 1
+    
+    def __iter__(self):
+        alive = self.alive
+        return (track for track in range(len(alive)) if alive[track])
+    
+    def intern(self, text):
+        if not text:
+            return 0
+        sid = self._string_ids.get(text)
+        if sid is None:
+            sid = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = sid
+        return sid
+    
+    def add_dir(self, directory):
+        did = self._dir_index.get(directory)
+        if did is None:
+            did = len(self.dirs)
+            self.dirs.append(directory)
+            self._dir_index[directory] = did
+            self._dir_files.append({})
+            if not directory:
+                self._prefixes.append(self._prefix)
+            elif os.path.isabs(directory):
+                self._prefixes.append(os.path.join(directory, ""))
+            else:
+                self._prefixes.append(self._prefix + directory + os.sep)
+        return did
+    
+    def split(self, path):
+        directory, filename = os.path.split(path)
+        prefix = self._prefix
+        if prefix and (directory + os.sep).startswith(prefix):
+            directory = directory[len(prefix):]
+        return directory, filename
+    
+    def find(self, path):
+        directory, filename = self.split(path)
+        did = self._dir_index.get(directory)
+        if did is None:
+            return None
+        return self._dir_files[did].get(filename)
+    
+    def find_file(self, did, filename):
+        return self._dir_files[did].get(filename)
+    
+    def _append(self, did, filename, name, duration, album_id, artist_id, album_artist_id, size, mtime, alive):
+        track = len(self.files)
+        self.dir_ids.append(did)
+        self.files.append(filename)
+        self.names.append(name)
+        self.durations.append(duration)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.album_ids.append(album_id)
+        self.artist_ids.append(artist_id)
+        self.album_artist_ids.append(album_artist_id)
+        self.alive.append(alive)
+        return track
+    
+    def add_file(self, did, filename, name, duration, album="", artist="", size=0, mtime=0, album_artist=""):
+        album_id = self.intern(album)
+        artist_id = self.intern(artist)
+        album_artist_id = self.intern(album_artist)
+        files = self._dir_files[did]
+        track = files.get(filename)
+        if track is None:
+            track = self._dead.pop((did, filename), None)
+        if track is None:
+            track = self._append(did, filename, name, duration, album_id, artist_id, album_artist_id, size, mtime, 1)
+            files[filename] = track
+            self.count += 1
+        else:
+            self.names[track] = name
+            self.durations[track] = duration
+            self.sizes[track] = size
+            self.mtimes[track] = mtime
+            self.album_ids[track] = album_id
+            self.artist_ids[track] = artist_id
+            self.album_artist_ids[track] = album_artist_id
+            if not self.alive[track]:
+                self.alive[track] = 1
+                files[filename] = track
+                self.count += 1
+        return track
+    
+    def add(self, path, name, duration, album="", artist="", size=0, mtime=0, album_artist=""):
+        directory, filename = self.split(path)
+        return self.add_file(self.add_dir(directory), filename, name, duration, album, artist, size, mtime, album_artist)
+    
+    def add_song(self, path, cache):
+        duration = UNKNOWN_DURATION if cache.timestamp == "--:--" else cache.duration
+        return self.add(path, cache.name, duration, cache.album, cache.artist, cache.size, cache.mtime, cache.album_artist)
+    
+    def adopt(self, other, track):
+        directory, filename = self.split(other.path(track))
+        did = self.add_dir(directory)
+        own = self._dir_files[did].get(filename, self._dead.get((did, filename)))
+        if own is not None:
+            return own
+        
+        own = self._append(
+            did, filename, other.name(track), other.durations[track],
+            self.intern(other.album(track)), self.intern(other.artist(track)), self.intern(other.album_artist(track)),
+            other.sizes[track], other.mtimes[track], 0
+        )
+        self._dead[(did, filename)] = own
+        return own
+    
+    def remove(self, path):
+        directory, filename = self.split(path)
+        did = self._dir_index.get(directory)
+        if did is None:
+            return None
+        track = self._dir_files[did].pop(filename, None)
+        if track is not None:
+            self.alive[track] = 0
+            self._dead[(did, filename)] = track
+            self.count -= 1
+        return track
+    
+    def path(self, track):
+        return self._prefixes[self.dir_ids[track]] + self.files[track]
+    
+    def name(self, track):
+        return self.names[track]
+    
+    def duration(self, track):
+        return max(0, self.durations[track])
+    
+    def timestamp(self, track):
+        return format_duration(self.durations[track])
+    
+    def album(self, track):
+        return self.strings[self.album_ids[track]]
+    
+    def artist(self, track):
+        return self.strings[self.artist_ids[track]]
+    
+    def album_artist(self, track):
+        return self.strings[self.album_artist_ids[track]]
+    
+    def album_artist_id(self, track):
+        return self.album_artist_ids[track] or self.artist_ids[track]
+    
+    def stat(self, track):
+        return self.sizes[track], self.mtimes[track]
+    
+    def song(self, track):
+        return SongCache(
+            self.names[track], self.duration(track), self.timestamp(track),
+            self.album(track), self.artist(track), self.sizes[track], self.mtimes[track], self.album_artist(track)
+        )
+    
+    def get(self, path):
+        track = self.find(path)
+        if track is None:
+            return None
+        return self.song(track)
+    
+    def iter_paths(self):
+        for did, files in enumerate(self._dir_files):
+            prefix = self._prefixes[did]
+            for filename in files:
+                yield prefix + filename
+    
+    def footprint(self):
+        size = sys.getsizeof(self._dir_files) + sum(map(sys.getsizeof, self._dir_files))
+        for column in (self.dir_ids, self.durations, self.sizes, self.mtimes, self.album_ids, self.artist_ids, self.album_artist_ids, self.alive):
+            size += sys.getsizeof(column)
+        for texts in (self.files, self.names, self.dirs, self.strings, self._prefixes):
+            size += sys.getsizeof(texts) + sum(map(sys.getsizeof, texts))
+        for index in (self._dir_index, self._string_ids, self._dead):
+            size += sys.getsizeof(index)
+        return size
+    
+    def stats(self):
+        stats = {}
+        for did, files in enumerate(self._dir_files):
+            prefix = self._prefixes[did]
+            for filename, track in files.items():
+                stats[prefix + filename] = (self.sizes[track], self.mtimes[track])
+        return stats
+
+def read_song_info(filepath, size=0, mtime=0):
+    from mutagen import File
+    try:
+        audio = File(filepath)
+        if audio is None:
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            return SongCache(name, 0, "--:--", None, "", size, mtime)
+        
+        duration = int(audio.info.length) if audio.info else 0
+        timestamp = format_duration(duration)
+        
+        title = artist = album = album_artist = ""
+        if audio.tags:
+            title = str(audio.tags.get('TIT2', audio.tags.get('title', [""]))[0])
+            artist = str(audio.tags.get('TPE1', audio.tags.get('artist', [""]))[0])
+            album = str(audio.tags.get('TALB', audio.tags.get('album', [""]))[0])
+            album_artist = str(audio.tags.get('TPE2', audio.tags.get('albumartist', [""]))[0])
+        
+        if title and artist:
+            name = f"{artist} - {title}"
+        elif title:
+            name = title
+        elif artist:
+            name = artist
+        else:
+            name = os.path.splitext(os.path.basename(filepath))[0]
+        
+        return SongCache(name, duration, timestamp, album, artist, size, mtime, album_artist)
+    except Exception:
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        return SongCache(name, 0, "--:--", None, "", size, mtime)
+
+def list_music_dir(directory):
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return None
+    
+    files = []
+    subdirs = []
+    for entry in entries:
+        if entry.name.startswith('.'):
+            continue
+        try:
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif os.path.normcase(os.path.splitext(entry.name)[1]) in MUSIC_EXTENSIONS:
+                st = entry.stat()
+                files.append((entry.path, st.st_size, st.st_mtime_ns))
+        except OSError:
+            continue
+    return files, subdirs
+
+def walk_music_files(root):
+    stack = [root]
+    while stack:
+        listing = list_music_dir(stack.pop())
+        if listing is None:
+            continue
+        files, subdirs = listing
+        yield from files
+        stack.extend(reversed(subdirs))
+
+def scan_songs(files, workers=DEFAULT_SCAN_WORKERS):
+    try:
+        workers = int(workers)
+    except (TypeError, ValueError):
+        workers = DEFAULT_SCAN_WORKERS
+    
+    if workers <= 1:
+        for path, size, mtime in files:
+            yield path, read_song_info(path, size, mtime)
+        return
+    
+    window = workers * 4
+    pending = deque()
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, size, mtime in files:
+            pending.append((path, pool.submit(read_song_info, path, size, mtime)))
+            if len(pending) >= window:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+        
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+
+class LibraryScan:
+    __slots__ = (
+        'root', 'workers', 'found', 'scanned', 'elapsed', 'finished', 'cancelled',
+        '_on_complete', '_cancel', '_lock', '_ready', '_thread'
+    )
+    
+    def __init__(self, root, workers=DEFAULT_SCAN_WORKERS, on_complete=None):
+        self.root = root
+        self.workers = workers
+        self.found = 0
+        self.scanned = 0
+        self.elapsed = 0.0
+        self.finished = False
+        self.cancelled = False
+        self._on_complete = on_complete
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._ready = []
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def cancel(self):
+        self._cancel.set()
+    
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def take(self):
+        with self._lock:
+            ready, self._ready = self._ready, []
+        return ready
+    
+    def _publish(self, batch):
+        if batch:
+            with self._lock:
+                self._ready.extend(batch)
+    
+    def _walk(self, pending):
+        try:
+            for item in walk_music_files(self.root):
+                if self._cancel.is_set():
+                    break
+                self.found += 1
+                pending.put(item)
+        finally:
+            pending.put(None)
+    
+    def _queued(self, pending):
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            yield item
+    
+    def _run(self):
+        start = time.monotonic()
+        pending = queue.Queue()
+        threading.Thread(target=self._walk, args=(pending,), daemon=True).start()
+        
+        results = {}
+        batch = []
+        last_publish = time.monotonic()
+        
+        try:
+            for song, cache in scan_songs(self._queued(pending), self.workers):
+                results[song] = cache
+                batch.append((song, cache))
+                self.scanned += 1
+                
+                if self._cancel.is_set():
+                    break
+                
+                now = time.monotonic()
+                if now - last_publish >= SCAN_PUBLISH_INTERVAL:
+                    self._publish(batch)
+                    batch = []
+                    last_publish = now
+            
+            self._publish(batch)
+            self.cancelled = self._cancel.is_set()
+            if results and not self.cancelled and self._on_complete is not None:
+                self._on_complete(results)
+        finally:
+            self.elapsed = time.monotonic() - start
+            self.finished = True
+
+def build_library(results, root=""):
+    library = LibraryTable(root)
+    for path in sorted(results):
+        library.add_song(path, results[path])
+    return list(library), library
+
+def find_changes(library, files):
+    changed = []
+    for path, stat in files.items():
+        track = library.find(path)
+        if track is None or library.stat(track) != stat:
+            changed.append(path)
+    removed = [path for path in library.iter_paths() if path not in files]
+    return changed, removed
+
+def apply_changes(library, catalog, playlist, scanned, removed):
+    removed_tracks = set()
+    for path in removed:
+        track = library.find(path)
+        if track is None:
+            continue
+        catalog.remove(track)
+        library.remove(path)
+        removed_tracks.add(track)
+    
+    added = []
+    changed = []
+    for path, cache in scanned:
+        track = library.find(path)
+        if track is None:
+            track = library.add_song(path, cache)
+            added.append(track)
+        else:
+            catalog.remove(track)
+            library.add_song(path, cache)
+        catalog.add(track)
+        changed.append(track)
+    
+    if removed_tracks:
+        playlist = [track for track in playlist if track not in removed_tracks]
+    if added:
+        playlist = sorted(playlist + added, key=library.path)
+    return playlist, changed, removed_tracks
\ No newline at end of file
@@ -1,33 +1,61 @@
 import os
 import sys
-import glob
+
+APP_VERSION = "1.0.1"
+
+USAGE = """usage: wmus [-h] [-v]
+
+  -h, --help     show this message and exit
+  -v, --version  print the version and exit"""
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    if sys.argv[1] in ("-v", "--version"):
+        print(APP_VERSION)
+        sys.exit(0)
+    if sys.argv[1] in ("-h", "--help"):
+        print(USAGE)
+        sys.exit(0)
+
+try:
+    import curses
+except ImportError:
+    if sys.platform.startswith("win"):
+        print("Missing 'windows-curses'. Please run: pip install windows-curses")
+        sys.exit(1)
+    else:
+        raise
+
 import time
 import random
-import json
 import locale
+from array import array
+from collections import deque
 from pathlib import Path
 from player import MusicPlayer, PlaybackState
-from mutagen import File
 from config import load_config, save_config
-from helpers import key_match, search, get_folder_hash, help_text
+from helpers import key_match, SearchIndex, help_text
+from library import (
+    LibraryTable, LibraryScan, scan_songs, walk_music_files, build_library, find_changes, apply_changes,
+    DEFAULT_SCAN_WORKERS, SCAN_PUBLISH_INTERVAL
+)
+from catalog import Catalog
+from store import open_store
+from playqueue import PlayQueue
+from watcher import LibraryWatcher, DEFAULT_WATCH_INTERVAL
+from prefetch import Prefetcher, DEFAULT_PREFETCH_MB, PREFETCH_AHEAD
+from metadata import MetadataService
+from remote import RemoteServer, REMOTE_POLL
 from ui import UI
 
-APP_VERSION = "1.0.1"
-CACHE_VERSION = "1.0"
+TRACK_END_POLL = 0.05
+SEEK_COALESCE = 0.15
+WAKEUP_WINDOW = 5.0
+STATS_FRAMES = 240
+STATS_REFRESH = 1.0
 
-CACHE_DIR = Path(os.getenv('LOCALAPPDATA')) / 'wmus' / 'cache'
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+REMOTE_INTERACTIVE = (":help", ":h", ":v", ":version")
 
-if sys.platform == "win32":
-    os.system("chcp 65001 > nul 2>&1")
-    if hasattr(sys.stdout, 'reconfigure'):
-        sys.stdout.reconfigure(encoding='utf-8')
-        sys.stderr.reconfigure(encoding='utf-8')
-else:
-    try:
-        locale.setlocale(locale.LC_ALL, '')
-    except locale.Error:
-        pass
+CACHE_DIR = Path(os.getenv('LOCALAPPDATA')) / 'wmus' / 'cache'
 
 UNICODE_SUPPORT = (
     sys.platform != "win32" or
@@ -35,54 +63,110 @@ UNICODE_SUPPORT = (
     os.getenv("TERM_PROGRAM") == "vscode"
 )
 
-if len(sys.argv) > 1 and sys.argv[1] in ("-v", "--version"):
-    print(APP_VERSION)
-    sys.exit(0)
-
-if sys.platform == "win32":
-    os.system(f"title wmus v{APP_VERSION}")
-else:
-    print(f"\33]0;wmus v{APP_VERSION}\a", end="", flush=True)
-
-try:
-    import curses
-except ImportError:
-    if sys.platform.startswith("win"):
-        print("Missing 'windows-curses'. Please run: pip install windows-curses")
-        sys.exit(1)
+def setup_terminal():
+    if sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetConsoleCP(65001)
+        kernel32.SetConsoleOutputCP(65001)
+        kernel32.SetConsoleTitleW(f"wmus v{APP_VERSION}")
+        if hasattr(sys.stdout, 'reconfigure'):
+            sys.stdout.reconfigure(encoding='utf-8')
+            sys.stderr.reconfigure(encoding='utf-8')
     else:
-        raise
+        try:
+            locale.setlocale(locale.LC_ALL, '')
+        except locale.Error:
+            pass
+        print(f"\33]0;wmus v{APP_VERSION}\a", end="", flush=True)
+
+class WakeupMeter:
+    __slots__ = ('count', 'rate', 'since')
+    
+    def __init__(self):
+        self.count = 0
+        self.rate = 0.0
+        self.since = time.monotonic()
+    
+    def tick(self):
+        self.count += 1
+        now = time.monotonic()
+        if now - self.since >= WAKEUP_WINDOW:
+            self.rate = self.count / (now - self.since)
+            self.count = 0
+            self.since = now
 
-class SongCache:
-    __slots__ = ('name', 'duration', 'timestamp', 'album', 'artist')
-    
-    def __init__(self, name, duration, timestamp, album, artist=""):
-        self.name = name
-        self.duration = duration
-        self.timestamp = timestamp
-        self.album = album
-        self.artist = artist
+class PerfStats:
+    __slots__ = ('render_times', 'search_time', 'search_query', 'memory', 'memory_key', 'memory_time')
+    
+    def __init__(self):
+        self.render_times = deque(maxlen=STATS_FRAMES)
+        self.search_time = None
+        self.search_query = ""
+        self.memory = 0
+        self.memory_key = None
+        self.memory_time = 0.0
+    
+    def render_percentile(self, fraction):
+        if not self.render_times:
+            return 0.0
+        times = sorted(self.render_times)
+        return times[min(len(times) - 1, int(len(times) * fraction))]
+    
+    def library_memory(self, cli):
+        key = (id(cli.library), cli.library_version)
+        now = time.monotonic()
+        if self.memory_key != key and now - self.memory_time >= STATS_REFRESH:
+            self.memory = cli.library.footprint()
+            if cli.catalog is not None:
+                self.memory += cli.catalog.footprint()
+            self.memory_key = key
+            self.memory_time = now
+        return self.memory
 
 class SearchState:
-    __slots__ = ('active', 'query', 'filtered_indices', 'selected')
+    __slots__ = ('active', 'query', 'filtered_indices', 'selected', 'matched', 'results_query', 'results_key')
     
     def __init__(self):
         self.active = False
         self.query = ""
         self.filtered_indices = None
         self.selected = 0
+        self.matched = None
+        self.results_query = None
+        self.results_key = None
     
     def activate(self):
         self.active = True
         self.query = ""
         self.filtered_indices = None
         self.selected = 0
+        self.matched = None
+        self.results_query = None
+        self.results_key = None
     
     def deactivate(self):
+        self.activate()
         self.active = False
-        self.query = ""
-        self.filtered_indices = None
-        self.selected = 0
+    
+    def update(self, index, key):
+        query = self.query
+        if self.results_key == key and self.results_query == query:
+            return
+        
+        if not query.strip():
+            self.matched = None
+            self.filtered_indices = index.search(query)
+        else:
+            within = None
+            if (self.matched is not None and self.results_key == key and
+                    query.lower().startswith(self.results_query.lower())):
+                within = self.matched
+            self.matched = index.match(query, within)
+            self.filtered_indices = self.matched + index.fuzzy(query, self.matched)
+        
+        self.results_query = query
+        self.results_key = key
 
 class CommandState:
     __slots__ = ('active', 'buffer')
@@ -101,16 +185,21 @@ class CommandState:
 
 class CLI:
     __slots__ = (
-        'player', 'config', 'keybindings', 'music_folder', 'seek_seconds',
-        'playlist', 'song_cache', 'current_index', 'current_song_path', 
+        'player', 'metadata', 'config', 'keybindings', 'music_folder', 'seek_seconds',
+        'playlist', 'track_index', 'library', 'current_index', 'current_track', 
         'selected_index', 'scroll_offset', 'shuffle', 'repeat', 'volume', 
-        'view_mode', 'queue_list', 'albums', 'album_names', 'album_view_selected',
-        'queue_index', 'album_songs_scroll', 'album_song_selected', 'album_column',
-        'error_message', 'ui', 'last_seek_time', 'last_seek_delta'
+        'view_mode', 'queue', 'catalog', 'album_view_selected',
+        'album_songs_scroll', 'album_song_selected', 'album_column',
+        'error_message', 'ui', 'last_seek_time', 'pending_seek', 'store',
+        'scanner', 'watcher', 'library_version', 'library_index', 'search_index',
+        'search_index_key', 'display_list', 'display_key', 'wakeup_meter', 'show_wakeups', 'preloaded',
+        'prefetcher', 'stats', 'last_scan', 'cache_load_time', 'remote', 'remote_key',
+        'scan_incomplete'
     )
     
     def __init__(self, stdscr, config):
-        self.player = MusicPlayer()
+        self.metadata = MetadataService()
+        self.player = MusicPlayer(self.metadata)
         self.ui = UI(stdscr)
         self.config = config
         self.keybindings = config.get("keybindings", {})
@@ -118,9 +207,11 @@ class CLI:
         self.seek_seconds = config.get("seek_seconds", 5)
         
         self.playlist = []
-        self.song_cache = {}
+        self.track_index = array('i')
+        self.library = self.metadata.library
+        self.catalog = Catalog(self.library)
         self.current_index = None
-        self.current_song_path = None
+        self.current_track = None
         self.selected_index = 0
         self.scroll_offset = 0
         
@@ -130,184 +221,264 @@ class CLI:
         self.player.set_volume(self.volume)
         
         self.view_mode = config.get("default_view", 1)
-        self.queue_list = []
-        self.queue_index = 0
+        self.queue = PlayQueue()
         
-        self.albums = {}
-        self.album_names = []
+        self.store = None
+        self.scanner = None
+        self.watcher = None
         self.album_view_selected = 0
         self.album_songs_scroll = 0
         self.album_song_selected = 0
         self.album_column = 0
         
+        self.library_version = 0
+        self.library_index = None
+        self.search_index = None
+        self.search_index_key = None
+        self.display_list = []
+        self.display_key = None
+        self.wakeup_meter = None
+        self.show_wakeups = False
+        self.stats = None
+        self.last_scan = None
+        self.cache_load_time = None
+        self.scan_incomplete = False
+        self.remote = None
+        self.remote_key = None
+        self.preloaded = None
+        self.prefetcher = Prefetcher(config.get("prefetch_mb", DEFAULT_PREFETCH_MB))
+        
         self.error_message = ""
         self.last_seek_time = 0
-        self.last_seek_delta = 0
+        self.pending_seek = 0
     
-    def _get_song_info(self, filepath):
-        if filepath in self.song_cache:
-            cached = self.song_cache[filepath]
-            return cached.name, cached.timestamp, cached.album, cached.artist
+    def _set_playlist(self, playlist):
+        self.playlist = playlist
+        self.track_index = array('i', [-1]) * len(self.library.files)
+        for idx, track in enumerate(playlist):
+            self.track_index[track] = idx
+        self.current_index = self._track_position(self.current_track)
+        self.library_version += 1
+    
+    def _track_position(self, track):
+        if track is None or track >= len(self.track_index):
+            return None
+        idx = self.track_index[track]
+        return idx if idx >= 0 else None
+    
+    def _replace_library(self, library, catalog=None):
+        old = self.library
         
-        try:
-            audio = File(filepath)
-            if not audio:
-                name = os.path.splitext(os.path.basename(filepath))[0]
-                cache = SongCache(name, 0, "--:--", None, "")
-                self.song_cache[filepath] = cache
-                return name, "--:--", None, ""
-            
-            duration = int(audio.info.length) if audio.info else 0
-            minutes = duration // 60
-            seconds = duration % 60
-            timestamp = f"{minutes:02}:{seconds:02}"
-            
-            title = artist = album = ""
-            if audio.tags:
-                title = str(audio.tags.get('TIT2', audio.tags.get('title', [""]))[0])
-                artist = str(audio.tags.get('TPE1', audio.tags.get('artist', [""]))[0])
-                album = str(audio.tags.get('TALB', audio.tags.get('album', [""]))[0])
-            
-            if title and artist:
-                name = f"{artist} - {title}"
-            elif title:
-                name = title
-            elif artist:
-                name = artist
-            else:
-                name = os.path.splitext(os.path.basename(filepath))[0]
-            
-            cache = SongCache(name, duration, timestamp, album, artist)
-            self.song_cache[filepath] = cache
-            return name, timestamp, album, artist
-        except Exception:
-            name = os.path.splitext(os.path.basename(filepath))[0]
-            cache = SongCache(name, 0, "--:--", None, "")
-            self.song_cache[filepath] = cache
-            return name, "--:--", None, ""
+        def carry(track):
+            return library.adopt(old, track)
+        
+        self.queue.remap(carry)
+        if self.current_track is not None:
+            self.current_track = carry(self.current_track)
+        self.library = self.metadata.library = library
+        self.catalog = catalog
+        self.library_index = None
+        self.preloaded = None
+    
+    def _clear_library(self, message, root=""):
+        library = LibraryTable(root)
+        self._replace_library(library, Catalog(library))
+        self._set_playlist([])
+        self.error_message = message
+    
+    def _find_music_files(self, path):
+        return {song: (size, mtime) for song, size, mtime in walk_music_files(path)}
     
     def load_playlist(self, path):
+        self.stop_scan()
+        self.stop_watcher()
+        self.scan_incomplete = False
         path = os.path.expanduser(path)
         
         if not path.strip():
-            self.playlist = []
-            self.song_cache = {}
-            self.albums = {}
-            self.album_names = []
-            self.error_message = "No music folder set. Use :add <folder> to add one"
+            self.store = None
+            self._clear_library("No music folder set. Use :add <folder> to add one")
             return
         
-        cache_file = CACHE_DIR / f"playlist_cache_{get_folder_hash(path)}.json"
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.store = open_store(CACHE_DIR, path, self.config.get("library_backend", "json"))
+        start = time.perf_counter()
+        cached = self.store.load()
+        self.cache_load_time = time.perf_counter() - start if cached is not None else None
         
-        if cache_file.exists():
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    cache = json.load(f)
-                
-                if cache.get("version") == CACHE_VERSION:
-                    self.playlist = cache.get("playlist", [])
-                    
-                    for song, data in cache.get("song_cache", {}).items():
-                        self.song_cache[song] = SongCache(
-                            data["name"], data["duration"], 
-                            data["timestamp"], data.get("album"), data.get("artist", "")
-                        )
-                    
-                    self.albums = cache.get("albums", {})
-                    self.album_names = sorted(self.albums.keys())
-                    self.error_message = ""
-                    return
-            except (json.JSONDecodeError, IOError):
-                pass
+        if cached is not None:
+            playlist, library = cached
+            self._replace_library(library)
+            self._set_playlist(playlist)
+            self.error_message = ""
+            self._start_watcher(path)
+            return
         
         if not os.path.exists(path):
-            self.playlist = []
-            self.song_cache = {}
-            self.albums = {}
-            self.album_names = []
-            self.error_message = "Music folder not found"
+            self._clear_library("Music folder not found")
             return
         
-        extensions = (
-            '*.mp3', '*.wav', '*.flac', '*.ogg', '*.aac', '*.m4a', '*.wma',
-            '*.opus', '*.ape', '*.wv', '*.tta'
-        )
+        self._clear_library("", path)
+        self._start_scan(path)
+    
+    def _start_scan(self, path):
+        store = self.store
         
-        songs = []
-        for ext in extensions:
-            songs.extend(glob.glob(os.path.join(path, "**", ext), recursive=True))
+        def save(results):
+            playlist, library = build_library(results, path)
+            store.save(playlist, library, Catalog.build(playlist, library))
         
-        if not songs:
-            self.playlist = []
-            self.song_cache = {}
-            self.albums = {}
-            self.album_names = []
-            self.error_message = "No music files found in folder"
+        workers = self.config.get("scan_workers", DEFAULT_SCAN_WORKERS)
+        self.scanner = LibraryScan(path, workers, on_complete=save)
+        self.scanner.start()
+    
+    def stop_scan(self):
+        if self.scanner is not None:
+            self.scanner.cancel()
+            self.scanner.join()
+            self.scanner = None
+    
+    def _poll_scan(self):
+        scanner = self.scanner
+        if scanner is None:
             return
         
-        self.playlist = sorted(songs)
-        self.song_cache = {}
-        self.albums = {}
+        finished = scanner.finished
+        batch = scanner.take()
+        if batch:
+            self._apply_library_changes(batch, ())
         
-        for song in self.playlist:
-            name, timestamp, album, artist = self._get_song_info(song)
-            if album:
-                if album not in self.albums:
-                    self.albums[album] = []
-                self.albums[album].append(song)
+        if finished:
+            self.scanner = None
+            self.last_scan = (scanner.elapsed, scanner.scanned)
+            if not self.playlist:
+                self.error_message = "No music files found in folder"
+            elif scanner.cancelled:
+                self.scan_incomplete = True
+                self.error_message = f"Scan cancelled: {len(self.playlist)} tracks loaded (use :refresh to finish)"
+            else:
+                self.error_message = f"Loaded {len(self.playlist)} tracks from folder"
+                self._start_watcher(scanner.root)
+    
+    def _apply_library_changes(self, scanned, removed):
+        selected = None
+        if self.view_mode == 1 and self.selected_index < len(self.playlist):
+            selected = self.playlist[self.selected_index]
         
-        self.album_names = sorted(self.albums.keys())
-        self.error_message = ""
+        library = self.library
+        playlist, changed, removed_tracks = apply_changes(library, self._get_catalog(), self.playlist, scanned, removed)
         
-        cache_data = {
-            "version": CACHE_VERSION,
-            "playlist": self.playlist,
-            "song_cache": {
-                song: {
-                    "name": cache.name,
-                    "duration": cache.duration,
-                    "timestamp": cache.timestamp,
-                    "album": cache.album,
-                    "artist": cache.artist
-                } for song, cache in self.song_cache.items()
-            },
-            "albums": self.albums
-        }
+        if self.library_index is not None:
+            self.library_index.remove(removed_tracks)
+            self.library_index.add((track, library.name(track)) for track in changed)
         
-        try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f)
-        except IOError:
-            pass
+        if playlist is not self.playlist:
+            self._set_playlist(playlist)
+        else:
+            self.library_version += 1
+        
+        position = self._track_position(selected)
+        if position is not None:
+            self.selected_index = position
+        elif self.selected_index >= len(self.playlist):
+            self.selected_index = max(0, len(self.playlist) - 1)
+    
+    def _start_watcher(self, path):
+        interval = self.config.get("watch_interval", DEFAULT_WATCH_INTERVAL)
+        if not interval or interval <= 0:
+            return
+        known = self.library.stats()
+        workers = self.config.get("scan_workers", DEFAULT_SCAN_WORKERS)
+        self.watcher = LibraryWatcher(path, known, interval, workers)
+        self.watcher.start()
+    
+    def stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+    
+    def _poll_watcher(self):
+        if self.watcher is None:
+            return
+        
+        for scanned, removed in self.watcher.take():
+            self._apply_library_changes(scanned, removed)
+            if self.store is not None:
+                changed = [song for song, cache in scanned]
+                self.store.update(self.playlist, self.library, self.catalog, changed, removed)
+            self.error_message = f"Library updated: {len(scanned)} new or changed, {len(removed)} removed"
     
     def refresh_playlist(self):
-        cache_file = CACHE_DIR / f"playlist_cache_{get_folder_hash(self.music_folder)}.json"
-        if cache_file.exists():
-            try:
-                cache_file.unlink()
-            except OSError:
-                pass
-        self.load_playlist(self.music_folder)
+        path = os.path.expanduser(self.music_folder)
+        
+        if self.store is None or not self.library or not path.strip() or not os.path.exists(path):
+            if self.store is not None:
+                self.store.clear()
+            self.load_playlist(self.music_folder)
+            self.selected_index = 0
+            self.scroll_offset = 0
+            return
+        
+        self.stop_watcher()
+        start = time.monotonic()
+        files = self._find_music_files(path)
+        changed, removed = find_changes(self.library, files)
+        
+        workers = self.config.get("scan_workers", DEFAULT_SCAN_WORKERS)
+        scanned = list(scan_songs(((song,) + files[song] for song in changed), workers))
+        self._apply_library_changes(scanned, removed)
+        self.last_scan = (time.monotonic() - start, len(files))
+        
+        self.error_message = "" if self.playlist else "No music files found in folder"
         self.selected_index = 0
         self.scroll_offset = 0
+        
+        if self.scan_incomplete:
+            self.store.save(self.playlist, self.library, self.catalog)
+            self.scan_incomplete = False
+        elif changed or removed:
+            self.store.update(self.playlist, self.library, self.catalog, changed, removed)
+        self._start_watcher(path)
     
-    def play_song(self, song_path):
+    def play_song(self, track):
+        song_path = self.library.path(track)
         try:
+            self.preloaded = None
             self.player.stop()
             self.player.load_song(song_path)
             self.player.play()
-            self.current_song_path = song_path
-            
-            if song_path in self.playlist:
-                self.current_index = self.playlist.index(song_path)
-                self.selected_index = self.current_index
-            
+            self._set_current_song(track)
             self.error_message = ""
         except FileNotFoundError:
             self.error_message = f"File not found: {os.path.basename(song_path)}"
         except Exception as e:
             self.error_message = f"Failed to play: {os.path.basename(song_path)}"
     
+    def _set_current_song(self, track):
+        self.current_track = track
+        
+        idx = self._track_position(track)
+        if idx is not None:
+            self.current_index = idx
+            self.selected_index = idx
+    
+    def _describe_song(self, track):
+        song_path = self.library.path(track)
+        details = self.metadata.details(song_path)
+        parts = [os.path.splitext(song_path)[1].lstrip('.').upper()]
+        if details.get("sample_rate"):
+            parts.append(f"{details['sample_rate'] / 1000:g} kHz")
+        if details.get("bits_per_sample"):
+            parts.append(f"{details['bits_per_sample']}-bit")
+        if details.get("channels"):
+            parts.append(f"{details['channels']}ch")
+        if details.get("bitrate"):
+            parts.append(f"{details['bitrate'] // 1000} kbps")
+        for key in ("genre", "date"):
+            if details.get(key):
+                parts.append(details[key])
+        return "Info: " + " | ".join(parts)
+    
     def toggle_play_pause(self):
         if self.player.state == PlaybackState.PLAYING:
             self.player.pause()
@@ -320,73 +491,120 @@ class CLI:
             if songs and self.selected_index < len(songs):
                 self.play_song(songs[self.selected_index])
     
+    def _adjacent_song(self, step):
+        if self.shuffle:
+            return random.choice(self.playlist)
+        
+        idx = self._track_position(self.current_track)
+        if idx is None:
+            return self.playlist[0]
+        return self.playlist[(idx + step) % len(self.playlist)]
+    
     def next_song(self):
         if not self.playlist:
             return
         
-        if self.shuffle:
-            song = random.choice(self.playlist)
-        else:
-            if self.current_song_path and self.current_song_path in self.playlist:
-                idx = self.playlist.index(self.current_song_path)
-                idx = (idx + 1) % len(self.playlist)
-            else:
-                idx = 0
-            song = self.playlist[idx]
-        
-        self.selected_index = self.playlist.index(song)
+        song = self._adjacent_song(1)
+        self.selected_index = self._track_position(song)
         self.play_song(song)
     
     def prev_song(self):
         if not self.playlist:
             return
         
-        if self.shuffle:
-            song = random.choice(self.playlist)
-        else:
-            if self.current_song_path and self.current_song_path in self.playlist:
-                idx = self.playlist.index(self.current_song_path)
-                idx = (idx - 1) % len(self.playlist)
-            else:
-                idx = 0
-            song = self.playlist[idx]
-        
-        self.selected_index = self.playlist.index(song)
+        song = self._adjacent_song(-1)
+        self.selected_index = self._track_position(song)
         self.play_song(song)
     
-    def _handle_song_finished(self):
-        if not (self.current_song_path and self.player.is_song_finished()):
+    def _upcoming_song(self):
+        if self.queue.has_next():
+            return self.queue.peek(), True
+        if self.repeat and self.current_track is not None:
+            return self.current_track, False
+        if self.playlist:
+            return self._adjacent_song(1), False
+        return None, False
+    
+    def _preload_key(self):
+        return (self.current_track, self.queue.version, self.repeat, self.shuffle, self.library_version)
+    
+    def _preload_next_song(self):
+        if self.player.state != PlaybackState.PLAYING:
             return
         
-        if self.queue_list and self.queue_index < len(self.queue_list):
-            next_song = self.queue_list[self.queue_index]
-            self.play_song(next_song)
-            self.queue_index += 1
-            return
+        key = self._preload_key()
+        if self.preloaded is None or self.preloaded[0] != key:
+            song, from_queue = self._upcoming_song()
+            self.preloaded = (key, song, from_queue, False)
+            
+            upcoming = self.queue[self.queue.cursor:self.queue.cursor + PREFETCH_AHEAD]
+            if song is not None and not from_queue:
+                upcoming.insert(0, song)
+            self.prefetcher.request([self.library.path(track) for track in upcoming])
+            
+            queued = self.player.queued_song
+            if queued is not None:
+                if song is not None and self.library.path(song) != queued:
+                    self.player.queue_song(self.library.path(song))
+                self.preloaded = (key, song, from_queue, True)
         
-        if self.repeat and self.current_song_path:
-            self.play_song(self.current_song_path)
+        key, song, from_queue, queued = self.preloaded
+        if song is not None and not queued and self.prefetcher.is_warm(self.library.path(song)):
+            if not self.player.queue_song(self.library.path(song)):
+                song = None
+            self.preloaded = (key, song, from_queue, True)
+    
+    def _handle_song_finished(self):
+        if self.current_track is None:
             return
         
-        if self.playlist:
-            if self.shuffle:
-                next_song = random.choice(self.playlist)
+        if self.player.poll_transition():
+            played = self.library.find(self.player.current_song)
+            preloaded, self.preloaded = self.preloaded, None
+            if preloaded is None:
+                song, from_queue = played, False
+            elif preloaded[0] == self._preload_key():
+                song, from_queue = preloaded[1], preloaded[2]
             else:
-                if self.current_song_path in self.playlist:
-                    idx = self.playlist.index(self.current_song_path)
-                    idx = (idx + 1) % len(self.playlist)
-                    next_song = self.playlist[idx]
-                else:
-                    next_song = self.playlist[0]
-            self.play_song(next_song)
+                song, from_queue = self._upcoming_song()
+            
+            if song is None or song == played:
+                if played is not None and self.queue.peek() == played:
+                    self.queue.advance()
+                self._set_current_song(played)
+            else:
+                if from_queue:
+                    self.queue.advance()
+                self.play_song(song)
+        elif self.player.is_song_finished():
+            song, from_queue = self._upcoming_song()
+            if from_queue:
+                self.queue.advance()
+            if song is not None:
+                self.play_song(song)
+        
+        self._preload_next_song()
+    
+    def _toggle_shuffle(self):
+        self.shuffle = not self.shuffle
+        self.error_message = f"Shuffle: {'ON' if self.shuffle else 'OFF'}"
+    
+    def _toggle_repeat(self):
+        self.repeat = not self.repeat
+        self.error_message = f"Repeat: {'ON' if self.repeat else 'OFF'}"
+    
+    def _set_volume(self, volume):
+        self.volume = max(0.0, min(1.0, volume))
+        self.player.set_volume(self.volume)
+        self.error_message = f"Volume: {int(self.volume * 100)}%"
     
     def _switch_view(self, view_num):
         if view_num == 1:
             self.view_mode = 1
             self.selected_index = 0
             self.scroll_offset = 0
-        elif view_num == 2:
-            self.view_mode = 2
+        elif view_num in (2, 4):
+            self.view_mode = view_num
             self.album_view_selected = 0
             self.scroll_offset = 0
             self.album_songs_scroll = 0
@@ -398,29 +616,80 @@ class CLI:
             self.scroll_offset = 0
     
     def _get_display_list(self):
+        key = self._display_key()
+        if self.display_key != key:
+            self.display_list = self._build_display_list()
+            self.display_key = key
+        return self.display_list
+    
+    def _build_display_list(self):
+        name = self.library.name
+        if self.view_mode == 3:
+            return [name(s) for s in self.queue]
+        elif self.view_mode in (2, 4):
+            return [name(s) for s in self._group_tracks(self.album_view_selected)]
+        return [name(s) for s in self.playlist]
+    
+    def _get_catalog(self):
+        if self.catalog is None:
+            catalog = self.store.load_catalog(self.library) if self.store is not None else None
+            self.catalog = catalog if catalog is not None else Catalog.build(self.playlist, self.library)
+        return self.catalog
+    
+    def _groups(self):
+        catalog = self._get_catalog()
+        if self.view_mode == 4:
+            return catalog.artist_order()
+        return catalog.album_order()
+    
+    def _group_tracks(self, idx):
+        groups = self._groups()
+        if idx >= len(groups):
+            return []
+        if self.view_mode == 4:
+            return self.catalog.artist_tracks(groups[idx])
+        return self.catalog.albums[groups[idx]]
+    
+    def _group_label(self, group):
+        if self.view_mode == 4:
+            return self.catalog.artist_name(group)
+        return self.catalog.album_label(group)
+    
+    def _group_count(self, group):
+        if self.view_mode == 4:
+            return self.catalog.artist_track_count(group)
+        return len(self.catalog.albums[group])
+    
+    def _display_key(self):
         if self.view_mode == 3:
-            return [(self.song_cache[s].name if s in self.song_cache else os.path.basename(s)) 
-                    for s in self.queue_list]
-        elif self.view_mode == 2:
-            if not self.album_names or self.album_view_selected >= len(self.album_names):
-                return []
-            album = self.album_names[self.album_view_selected]
-            return [(self.song_cache[s].name if s in self.song_cache else os.path.basename(s)) 
-                    for s in self.albums.get(album, [])]
-        return [self.song_cache[s].name if s in self.song_cache else os.path.basename(s) 
-                for s in self.playlist]
+            return (3, self.queue.version, self.library_version)
+        elif self.view_mode in (2, 4):
+            return (self.view_mode, self.album_view_selected, self.library_version)
+        return (1, self.library_version)
+    
+    def _get_search_index(self):
+        key = self._display_key()
+        if self.view_mode == 1:
+            if self.library_index is None:
+                name = self.library.name
+                self.library_index = SearchIndex([name(t) for t in self.playlist], self.playlist)
+            self.library_index.set_order(self.playlist, self.track_index)
+            self.search_index_key = key
+            return self.library_index
+        if self.search_index is None or self.search_index_key != key:
+            self.search_index = SearchIndex(self._get_display_list())
+            self.search_index_key = key
+        return self.search_index
     
     def _get_current_songs(self):
         if self.view_mode == 3:
-            return self.queue_list
-        elif self.view_mode == 2:
-            if not self.album_names or self.album_view_selected >= len(self.album_names):
-                return []
-            return self.albums.get(self.album_names[self.album_view_selected], [])
+            return self.queue
+        elif self.view_mode in (2, 4):
+            return self._group_tracks(self.album_view_selected)
         return self.playlist
     
     def _handle_navigation(self, key):
-        if self.view_mode == 2:
+        if self.view_mode in (2, 4):
             self._handle_album_navigation(key)
         elif self.view_mode == 3:
             self._handle_queue_navigation(key)
@@ -442,9 +711,8 @@ class CLI:
         elif key_match(key, kb.get("queue", [])):
             if self.playlist and self.selected_index < len(self.playlist):
                 song = self.playlist[self.selected_index]
-                if song not in self.queue_list:
-                    self.queue_list.append(song)
-                    self.error_message = f"Added to queue: {self.song_cache[song].name if song in self.song_cache else os.path.basename(song)}"
+                if self.queue.add(song):
+                    self.error_message = f"Added to queue: {self.library.name(song)}"
                 else:
                     self.error_message = "Song already in queue"
                 if self.selected_index < len(self.playlist) - 1:
@@ -454,30 +722,26 @@ class CLI:
         kb = self.keybindings
         
         if key_match(key, kb["down"]):
-            if self.selected_index < len(self.queue_list) - 1:
+            if self.selected_index < len(self.queue) - 1:
                 self.selected_index += 1
         elif key_match(key, kb["up"]):
             if self.selected_index > 0:
                 self.selected_index -= 1
         elif key_match(key, kb["enter"]):
-            if self.queue_list and self.selected_index < len(self.queue_list):
-                self.play_song(self.queue_list[self.selected_index])
-                self.queue_index = self.selected_index + 1
+            if self.queue and self.selected_index < len(self.queue):
+                self.play_song(self.queue[self.selected_index])
+                self.queue.play_from(self.selected_index)
         elif key in (curses.KEY_DC, ord('d')):
-            if self.queue_list and self.selected_index < len(self.queue_list):
-                removed_song = self.queue_list[self.selected_index]
-                del self.queue_list[self.selected_index]
-                self.error_message = f"Removed: {self.song_cache[removed_song].name if removed_song in self.song_cache else os.path.basename(removed_song)}"
-                if self.selected_index >= len(self.queue_list) and self.queue_list:
-                    self.selected_index = len(self.queue_list) - 1
-                if self.queue_index > self.selected_index:
-                    self.queue_index -= 1
+            if self.queue and self.selected_index < len(self.queue):
+                removed_song = self.queue.remove_at(self.selected_index)
+                self.error_message = f"Removed: {self.library.name(removed_song)}"
+                if self.selected_index >= len(self.queue) and self.queue:
+                    self.selected_index = len(self.queue) - 1
     
     def _handle_album_navigation(self, key):
         kb = self.keybindings
-        album_names = self.album_names
-        selected_album = album_names[self.album_view_selected] if album_names else None
-        album_songs = self.albums.get(selected_album, []) if selected_album else []
+        album_names = self._groups()
+        album_songs = self._group_tracks(self.album_view_selected)
         
         if key_match(key, kb["down"]):
             if self.album_column == 0:
@@ -511,21 +775,18 @@ class CLI:
         elif key_match(key, kb.get("queue", [])):
             if self.album_column == 1 and album_songs and self.album_song_selected < len(album_songs):
                 song = album_songs[self.album_song_selected]
-                if song not in self.queue_list:
-                    self.queue_list.append(song)
-                    self.error_message = f"Added to queue: {self.song_cache[song].name if song in self.song_cache else os.path.basename(song)}"
+                if self.queue.add(song):
+                    self.error_message = f"Added to queue: {self.library.name(song)}"
                 else:
                     self.error_message = "Song already in queue"
-            elif self.album_column == 0 and selected_album:
-                added_count = 0
-                for song in album_songs:
-                    if song not in self.queue_list:
-                        self.queue_list.append(song)
-                        added_count += 1
+            elif self.album_column == 0 and album_songs:
+                selected_album = self._group_label(album_names[self.album_view_selected])
+                kind = "artist" if self.view_mode == 4 else "album"
+                added_count = self.queue.extend(album_songs)
                 if added_count > 0:
                     self.error_message = f"Added {added_count} songs from '{selected_album}' to queue"
                 else:
-                    self.error_message = "All songs from album already in queue"
+                    self.error_message = f"All songs from {kind} already in queue"
     
     def _handle_command(self, cmd):
         if cmd in (":help", ":h"):
@@ -542,13 +803,42 @@ class CLI:
                 self.load_playlist(self.music_folder)
                 self.selected_index = 0
                 self.scroll_offset = 0
-                self.error_message = f"Loaded {len(self.playlist)} tracks from folder"
+                if self.scanner is not None:
+                    self.error_message = "Scanning library..."
+                else:
+                    self.error_message = f"Loaded {len(self.playlist)} tracks from folder"
             else:
                 self.error_message = "Folder not found"
         
         elif cmd == ":refresh":
-            self.refresh_playlist()
-            self.error_message = f"Refreshed library: {len(self.playlist)} tracks"
+            if self.scanner is not None:
+                self.error_message = "Library scan in progress (use :cancel to stop it)"
+            else:
+                self.refresh_playlist()
+                self.error_message = f"Refreshed library: {len(self.playlist)} tracks"
+        
+        elif cmd == ":cancel":
+            if self.scanner is not None:
+                self.scanner.cancel()
+                self.error_message = "Cancelling library scan..."
+            else:
+                self.error_message = "No library scan in progress"
+        
+        elif cmd == ":info":
+            if self.current_track is not None:
+                self.error_message = self._describe_song(self.current_track)
+            else:
+                self.error_message = "No track playing"
+        
+        elif cmd == ":wakeups":
+            self.show_wakeups = not self.show_wakeups
+            self._update_wakeup_meter()
+            self.error_message = f"Wakeup meter {'ON' if self.show_wakeups else 'OFF'}"
+        
+        elif cmd == ":stats":
+            self.stats = PerfStats() if self.stats is None else None
+            self._update_wakeup_meter()
+            self.error_message = f"Stats overlay {'ON' if self.stats is not None else 'OFF'}"
         
         elif cmd == ":q":
             return True
@@ -558,23 +848,18 @@ class CLI:
             self.error_message = ""
         
         elif cmd in (":clear", ":c"):
-            count = len(self.queue_list)
-            self.queue_list = []
-            self.queue_index = 0
+            count = self.queue.clear()
             self.error_message = f"Cleared {count} songs from queue"
         
         elif cmd.startswith(":remove ") or cmd.startswith(":r "):
             try:
                 idx_str = cmd.split(" ", 1)[1].strip() if " " in cmd else ""
                 idx = int(idx_str) - 1
-                if 0 <= idx < len(self.queue_list):
-                    removed = self.queue_list[idx]
-                    del self.queue_list[idx]
-                    if self.queue_index > idx:
-                        self.queue_index -= 1
-                    if self.selected_index >= len(self.queue_list) and self.queue_list:
-                        self.selected_index = len(self.queue_list) - 1
-                    self.error_message = f"Removed: {self.song_cache[removed].name if removed in self.song_cache else os.path.basename(removed)}"
+                if 0 <= idx < len(self.queue):
+                    removed = self.queue.remove_at(idx)
+                    if self.selected_index >= len(self.queue) and self.queue:
+                        self.selected_index = len(self.queue) - 1
+                    self.error_message = f"Removed: {self.library.name(removed)}"
                 else:
                     self.error_message = "Invalid queue index"
             except (ValueError, IndexError):
@@ -585,12 +870,163 @@ class CLI:
         
         return False
     
+    def start_remote(self):
+        if not self.config.get("remote_control", sys.platform != "win32"):
+            return
+        remote = RemoteServer(self.config.get("remote_address") or None)
+        try:
+            remote.start()
+        except OSError as e:
+            self.error_message = f"Remote control disabled: {e}"
+            return
+        self.remote = remote
+        self._publish_status()
+    
+    def stop_remote(self):
+        if self.remote is not None:
+            self.remote.stop()
+            self.remote = None
+    
+    def _enqueue_path(self, path):
+        path = os.path.normpath(os.path.expanduser(path))
+        track = self.library.find(path)
+        if track is not None and self._track_position(track) is not None:
+            if self.queue.add(track):
+                self.error_message = f"Added to queue: {self.library.name(track)}"
+            else:
+                self.error_message = "Song already in queue"
+            return True
+        
+        if not os.path.isdir(path):
+            self.error_message = f"Not in library: {path}"
+            return False
+        
+        prefix = os.path.join(path, "")
+        tracks = [track for track in self.playlist if self.library.path(track).startswith(prefix)]
+        if not tracks:
+            self.error_message = f"Not in library: {path}"
+            return False
+        added_count = self.queue.extend(tracks)
+        self.error_message = f"Added {added_count} songs from '{os.path.basename(path)}' to queue"
+        return True
+    
+    def _handle_remote_command(self, cmd):
+        name, _, arg = cmd.partition(" ")
+        arg = arg.strip()
+        self.error_message = ""
+        
+        if name == "status":
+            pass
+        elif name == "play":
+            if self.player.state != PlaybackState.PLAYING:
+                self.toggle_play_pause()
+        elif name == "pause":
+            if self.player.state == PlaybackState.PLAYING:
+                self.toggle_play_pause()
+        elif name == "toggle":
+            self.toggle_play_pause()
+        elif name == "next":
+            self.next_song()
+        elif name == "prev":
+            self.prev_song()
+        elif name == "shuffle":
+            self._toggle_shuffle()
+        elif name == "repeat":
+            self._toggle_repeat()
+        elif name == "enqueue" and arg:
+            return self._enqueue_path(arg), False
+        elif name == "seek" and arg:
+            if self.player.current_song is None:
+                self.error_message = "Nothing is playing"
+                return False, False
+            try:
+                seconds = int(arg)
+            except ValueError:
+                self.error_message = f"Invalid seek: {arg}"
+                return False, False
+            self.pending_seek += seconds if arg[0] in "+-" else seconds - self.player.get_pos()
+            self._apply_seek()
+        elif name == "volume" and arg:
+            try:
+                percent = int(arg)
+            except ValueError:
+                self.error_message = f"Invalid volume: {arg}"
+                return False, False
+            self._set_volume((self.volume * 100 + percent if arg[0] in "+-" else percent) / 100)
+        elif cmd in REMOTE_INTERACTIVE:
+            self.error_message = f"Not available remotely: {cmd}"
+            return False, False
+        elif name.startswith(":"):
+            if self._handle_command(cmd):
+                return True, True
+            return not self.error_message.startswith("Unknown command"), False
+        else:
+            self.error_message = f"Unknown command: {cmd}"
+            return False, False
+        return True, False
+    
+    def _poll_remote(self):
+        if self.remote is None:
+            return False
+        
+        quit = False
+        for request in self.remote.take():
+            results = []
+            for cmd in request.commands:
+                if quit:
+                    break
+                ok, quit = self._handle_remote_command(cmd)
+                results.append({"command": cmd, "ok": ok, "message": self.error_message})
+            self._publish_status()
+            request.finish(self.remote.reply(results))
+        
+        self._publish_status()
+        return quit
+    
+    def _publish_status(self):
+        player = self.player
+        track = self.current_track
+        key = (
+            track, player.state, player.start_time, player.pause_time, self.volume,
+            self.shuffle, self.repeat, self.queue.version, self.library_version
+        )
+        if self.remote_key == key:
+            return
+        self.remote_key = key
+        
+        library = self.library
+        status = {
+            "state": player.state.name.lower(),
+            "file": library.path(track) if track is not None else None,
+            "name": library.name(track) if track is not None else None,
+            "artist": library.artist(track) if track is not None else None,
+            "album": library.album(track) if track is not None else None,
+            "duration": library.duration(track) if track is not None else 0,
+            "position": player.get_pos(),
+            "volume": int(self.volume * 100),
+            "shuffle": self.shuffle,
+            "repeat": self.repeat,
+            "queue": len(self.queue),
+            "tracks": len(self.playlist),
+        }
+        started = player.start_time if player.state == PlaybackState.PLAYING else None
+        self.remote.publish(status, started)
+    
+    def _save_settings(self):
+        self.config["volume"] = self.volume
+        self.config["shuffle"] = self.shuffle
+        self.config["repeat"] = self.repeat
+        save_config(self.config)
+    
+    def _update_wakeup_meter(self):
+        if not self.show_wakeups and self.stats is None:
+            self.wakeup_meter = None
+        elif self.wakeup_meter is None:
+            self.wakeup_meter = WakeupMeter()
+    
     def _handle_quit_prompt(self, key):
         if key in (ord('y'), ord('Y')):
-            self.config["volume"] = self.volume
-            self.config["shuffle"] = self.shuffle
-            self.config["repeat"] = self.repeat
-            save_config(self.config)
+            self._save_settings()
             return True
         return False
     
@@ -599,10 +1035,7 @@ class CLI:
             command_state.deactivate()
         elif key in (10, 13):
             if self._handle_command(command_state.buffer.strip()):
-                self.config["volume"] = self.volume
-                self.config["shuffle"] = self.shuffle
-                self.config["repeat"] = self.repeat
-                save_config(self.config)
+                self._save_settings()
                 return True
             command_state.deactivate()
         elif key in (curses.KEY_BACKSPACE, 127, 8):
@@ -612,13 +1045,10 @@ class CLI:
         return False
     
     def _handle_search_input(self, key, search_state):
-        if self.view_mode == 2:
+        if self.view_mode in (2, 4):
             search_state.deactivate()
             return
         
-        display_list = self._get_display_list()
-        search_state.filtered_indices = search(search_state.query, display_list)
-        
         if key == curses.KEY_DOWN:
             if search_state.filtered_indices and search_state.selected < len(search_state.filtered_indices) - 1:
                 search_state.selected += 1
@@ -641,16 +1071,32 @@ class CLI:
             search_state.query += chr(key)
             search_state.selected = 0
         
+        if search_state.active:
+            if self.stats is None:
+                search_state.update(self._get_search_index(), self.search_index_key)
+            else:
+                start = time.perf_counter()
+                search_state.update(self._get_search_index(), self.search_index_key)
+                self.stats.search_time = time.perf_counter() - start
+                self.stats.search_query = search_state.query
+        
         if search_state.filtered_indices and search_state.selected >= len(search_state.filtered_indices):
             search_state.selected = max(0, len(search_state.filtered_indices) - 1)
     
     def _seek_with_throttle(self, delta):
-        now = time.time()
-        if self.last_seek_delta == delta and (now - self.last_seek_time) < 0.15:
+        self.pending_seek += delta
+        if time.time() - self.last_seek_time >= SEEK_COALESCE:
+            self._apply_seek()
+    
+    def _apply_seek(self):
+        delta, self.pending_seek = self.pending_seek, 0
+        if not delta:
             return
-        self.last_seek_time = now
-        self.last_seek_delta = delta
+        
+        self.last_seek_time = time.time()
         self.player.seek(delta)
+        if self.player.queued_song is None:
+            self.preloaded = None
         direction = "forward" if delta > 0 else "backward"
         self.error_message = f"Seeked {direction} {abs(delta)}s"
     
@@ -663,15 +1109,13 @@ class CLI:
             command_state.activate()
             self.error_message = ""
         elif key_match(key, kb.get("search", [])):
-            if self.view_mode != 2:
+            if self.view_mode not in (2, 4):
                 search_state.activate()
                 self.error_message = ""
         elif key_match(key, kb.get("shuffle", [])):
-            self.shuffle = not self.shuffle
-            self.error_message = f"Shuffle: {'ON' if self.shuffle else 'OFF'}"
+            self._toggle_shuffle()
         elif key_match(key, kb.get("repeat", [])):
-            self.repeat = not self.repeat
-            self.error_message = f"Repeat: {'ON' if self.repeat else 'OFF'}"
+            self._toggle_repeat()
         elif key_match(key, kb["next"]):
             self.next_song()
         elif key_match(key, kb["prev"]):
@@ -679,21 +1123,17 @@ class CLI:
         elif key_match(key, kb["play_pause"]):
             self.toggle_play_pause()
         elif key_match(key, kb.get("volume_up", [])):
-            self.volume = min(1.0, self.volume + 0.05)
-            self.player.set_volume(self.volume)
-            self.error_message = f"Volume: {int(self.volume * 100)}%"
+            self._set_volume(self.volume + 0.05)
         elif key_match(key, kb.get("volume_down", [])):
-            self.volume = max(0.0, self.volume - 0.05)
-            self.player.set_volume(self.volume)
-            self.error_message = f"Volume: {int(self.volume * 100)}%"
+            self._set_volume(self.volume - 0.05)
         elif key_match(key, kb.get("fadeout", [])):
             self.player.fadeout()
             self.error_message = "Fading out..."
-        elif key_match(key, kb.get("seek_forward", [])) and self.view_mode != 2:
+        elif key_match(key, kb.get("seek_forward", [])) and self.view_mode not in (2, 4):
             self._seek_with_throttle(self.seek_seconds)
-        elif key_match(key, kb.get("seek_backward", [])) and self.view_mode != 2:
+        elif key_match(key, kb.get("seek_backward", [])) and self.view_mode not in (2, 4):
             self._seek_with_throttle(-self.seek_seconds)
-        elif key in (ord('1'), ord('2'), ord('3')):
+        elif key in (ord('1'), ord('2'), ord('3'), ord('4')):
             self._switch_view(int(chr(key)))
             self.error_message = ""
         else:
@@ -701,22 +1141,68 @@ class CLI:
         
         return False
     
-    def process_input(self):
-        self.ui.stdscr.nodelay(True)
+    def _next_wakeup(self):
+        delays = []
+        if self.scanner is not None:
+            delays.append(SCAN_PUBLISH_INTERVAL)
+        if self.watcher is not None:
+            delays.append(self.watcher.interval)
+        if self.pending_seek:
+            delays.append(self.last_seek_time + SEEK_COALESCE - time.time())
+        if self.ui.message_display_time > 0:
+            delays.append(self.ui.message_display_time + self.ui.message_duration - time.time())
+        if self.stats is not None:
+            delays.append(STATS_REFRESH)
+        if self.remote is not None and not self.remote.can_wake:
+            delays.append(REMOTE_POLL)
+        
+        if self.player.state == PlaybackState.PLAYING:
+            elapsed = time.time() - self.player.start_time
+            delays.append(1.0 - elapsed % 1.0)
+            duration = self.library.duration(self.current_track) if self.current_track is not None else 0
+            if duration <= 0 or -2.0 < duration - elapsed < 1.0:
+                delays.append(TRACK_END_POLL)
         
+        if not delays:
+            return -1
+        return max(1, int(min(delays) * 1000) + 1)
+    
+    def process_input(self):
         search_state = SearchState()
         command_state = CommandState()
         quit_prompt = False
-        
-        self.ui.render(self, quit_prompt, search_state, command_state)
+        pending_input = False
         
         while True:
-            self._handle_song_finished()
-            self.ui.render(self, quit_prompt, search_state, command_state)
+            if pending_input:
+                self.ui.stdscr.timeout(0)
+            else:
+                if self.pending_seek and time.time() - self.last_seek_time >= SEEK_COALESCE:
+                    self._apply_seek()
+                self._poll_scan()
+                self._poll_watcher()
+                self._handle_song_finished()
+                if self._poll_remote():
+                    self._save_settings()
+                    break
+                if self.stats is None:
+                    self.ui.render(self, quit_prompt, search_state, command_state)
+                else:
+                    start = time.perf_counter()
+                    self.ui.render(self, quit_prompt, search_state, command_state)
+                    self.stats.render_times.append(time.perf_counter() - start)
+                self.ui.stdscr.timeout(self._next_wakeup())
             
+            if self.remote is not None:
+                self.remote.waiting = not pending_input
             key = self.ui.stdscr.getch()
+            if self.remote is not None:
+                self.remote.waiting = False
+            if not pending_input and self.wakeup_meter is not None:
+                self.wakeup_meter.tick()
+            
+            pending_input = key != -1
             if key == -1:
-                time.sleep(0.005)
                 continue
             
             if quit_prompt:
@@ -742,7 +1228,15 @@ def main(stdscr):
     stdscr.keypad(True)
     cli = CLI(stdscr, config)
     cli.load_playlist(cli.music_folder)
-    cli.process_input()
+    cli.start_remote()
+    try:
+        cli.process_input()
+    finally:
+        cli.stop_remote()
+        cli.stop_scan()
+        cli.stop_watcher()
+        cli.prefetcher.stop()
 
 if __name__ == "__main__":
+    setup_terminal()
     curses.wrapper(main)
\ No newline at end of file
@@ -0,0 +1,83 @@
+import os
+from library import LibraryTable, read_song_info
+
+METADATA_CACHE_SIZE = 256
+
+DETAIL_TAGS = (
+    ('title', 'TIT2'),
+    ('artist', 'TPE1'),
+    ('album', 'TALB'),
+    ('albumartist', 'TPE2'),
+    ('genre', 'TCON'),
+    ('date', 'TDRC'),
+    ('tracknumber', 'TRCK'),
+    ('discnumber', 'TPOS'),
+)
+
+DETAIL_INFO = ('length', 'bitrate', 'sample_rate', 'channels', 'bits_per_sample')
+
+def read_song_details(filepath):
+    from mutagen import File
+    details = {}
+    try:
+        audio = File(filepath)
+        if audio is None:
+            return details
+        
+        if audio.info:
+            for attr in DETAIL_INFO:
+                value = getattr(audio.info, attr, None)
+                if value:
+                    details[attr] = value
+        
+        if audio.tags:
+            for key, frame in DETAIL_TAGS:
+                value = audio.tags.get(frame, audio.tags.get(key))
+                if value:
+                    details[key] = str(value[0])
+    except Exception:
+        pass
+    return details
+
+class MetadataService:
+    __slots__ = ('library', '_songs', '_details')
+    
+    def __init__(self, library=None):
+        self.library = library if library is not None else LibraryTable()
+        self._songs = {}
+        self._details = {}
+    
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        if len(cache) > METADATA_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    
+    def song(self, path):
+        cache = self.library.get(path)
+        if cache is not None:
+            return cache
+        
+        cache = self._songs.get(path)
+        if cache is None:
+            try:
+                st = os.stat(path)
+                cache = read_song_info(path, st.st_size, st.st_mtime_ns)
+            except OSError:
+                cache = read_song_info(path)
+            self._remember(self._songs, path, cache)
+        return cache
+    
+    def duration(self, path):
+        return self.song(path).duration
+    
+    def details(self, path):
+        cache = self.song(path)
+        stamp = (cache.size, cache.mtime)
+        
+        entry = self._details.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        
+        details = read_song_details(path)
+        self._remember(self._details, path, (stamp, details))
+        return details
\ No newline at end of file
@@ -1,9 +1,16 @@
 import os
-os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
-import pygame
-from mutagen import File
 import time
 from enum import IntEnum
+from metadata import MetadataService
+
+pygame = None
+
+def import_pygame():
+    global pygame
+    if pygame is None:
+        os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+        import pygame
+    return pygame
 
 class PlaybackState(IntEnum):
     STOPPED = 0
@@ -11,9 +18,13 @@ class PlaybackState(IntEnum):
     PAUSED = 2
 
 class MusicPlayer:
-    __slots__ = ('current_song', 'state', 'start_time', 'pause_time', '_cached_info', '_cached_duration')
+    __slots__ = (
+        'current_song', 'state', 'start_time', 'pause_time', 'queued_song',
+        'metadata', '_mixer_pos', '_can_set_pos'
+    )
     
-    def __init__(self):
+    def __init__(self, metadata=None):
+        import_pygame()
         try:
             pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
         except Exception:
@@ -22,8 +33,10 @@ class MusicPlayer:
         self.state = PlaybackState.STOPPED
         self.start_time = 0
         self.pause_time = 0
-        self._cached_info = None
-        self._cached_duration = 0
+        self.queued_song = None
+        self._mixer_pos = 0
+        self._can_set_pos = True
+        self.metadata = metadata if metadata is not None else MetadataService()
 
     @property
     def playing(self):
@@ -32,8 +45,6 @@ class MusicPlayer:
     def load_song(self, song_path):
         if not os.path.exists(song_path):
             self.current_song = None
-            self._cached_info = None
-            self._cached_duration = 0
             raise FileNotFoundError(f"Song not found: {song_path}")
         
         pygame.mixer.music.load(song_path)
@@ -41,20 +52,23 @@ class MusicPlayer:
         self.state = PlaybackState.STOPPED
         self.start_time = 0
         self.pause_time = 0
-        self._cached_info = None
-        self._cached_duration = 0
+        self.queued_song = None
+        self._mixer_pos = 0
+        self._can_set_pos = True
 
     def play(self):
         if self.current_song:
             pygame.mixer.music.play()
             self.state = PlaybackState.PLAYING
             self.start_time = time.time() - self.pause_time
+            self._mixer_pos = 0
 
     def stop(self):
         pygame.mixer.music.stop()
         self.state = PlaybackState.STOPPED
         self.start_time = 0
         self.pause_time = 0
+        self.queued_song = None
 
     def pause(self):
         if self.state == PlaybackState.PLAYING:
@@ -74,6 +88,7 @@ class MusicPlayer:
     def fadeout(self, ms=2000):
         pygame.mixer.music.fadeout(ms)
         self.state = PlaybackState.STOPPED
+        self.queued_song = None
 
     def set_volume(self, volume):
         pygame.mixer.music.set_volume(max(0.0, min(1.0, volume)))
@@ -82,39 +97,43 @@ class MusicPlayer:
         return pygame.mixer.music.get_volume()
 
     def queue_song(self, song_path):
-        if os.path.exists(song_path):
+        if self.state != PlaybackState.PLAYING or not os.path.exists(song_path):
+            return False
+        
+        try:
             pygame.mixer.music.queue(song_path)
+        except pygame.error:
+            return False
+        self.queued_song = song_path
+        return True
+
+    def poll_transition(self):
+        if self.queued_song is None or self.state != PlaybackState.PLAYING:
+            return False
+        
+        pos = pygame.mixer.music.get_pos()
+        if pos < 0 or pos >= self._mixer_pos:
+            self._mixer_pos = max(pos, self._mixer_pos)
+            return False
+        
+        self.current_song = self.queued_song
+        self.queued_song = None
+        self.start_time = time.time() - pos / 1000
+        self.pause_time = 0
+        self._mixer_pos = pos
+        self._can_set_pos = True
+        return True
 
     def get_song_info(self):
         if not self.current_song:
             return {}
         
-        if self._cached_info is not None:
-            return self._cached_info
-        
-        try:
-            audio = File(self.current_song)
-            if not audio:
-                self._cached_info = {"title": "", "artist": "", "duration": 0}
-                return self._cached_info
-            
-            self._cached_duration = int(audio.info.length) if audio.info else 0
-            title = ""
-            artist = ""
-            
-            if audio.tags:
-                title = str(audio.tags.get('TIT2', audio.tags.get('title', [""]))[0])
-                artist = str(audio.tags.get('TPE1', audio.tags.get('artist', [""]))[0])
-            
-            self._cached_info = {
-                "title": title,
-                "artist": artist,
-                "duration": self._cached_duration
-            }
-            return self._cached_info
-        except Exception:
-            self._cached_info = {"title": "", "artist": "", "duration": 0}
-            return self._cached_info
+        details = self.metadata.details(self.current_song)
+        return {
+            "title": details.get("title", ""),
+            "artist": details.get("artist", ""),
+            "duration": self.metadata.duration(self.current_song)
+        }
 
     def get_pos(self):
         if self.state == PlaybackState.PLAYING and self.start_time > 0:
@@ -123,32 +142,44 @@ class MusicPlayer:
             return int(self.pause_time)
         return 0
 
+    def _set_pos(self, pos):
+        if not self._can_set_pos:
+            return False
+        
+        try:
+            pygame.mixer.music.rewind()
+            pygame.mixer.music.set_pos(pos)
+        except pygame.error:
+            self._can_set_pos = False
+            return False
+        return True
+
     def seek(self, seconds):
         if not self.current_song:
             return
         
-        if self._cached_duration == 0:
-            try:
-                audio = File(self.current_song)
-                self._cached_duration = int(audio.info.length) if audio and audio.info else 0
-            except Exception:
-                return
-        
+        duration = self.metadata.duration(self.current_song)
         current_pos = self.get_pos()
-        new_pos = max(0, min(current_pos + seconds, self._cached_duration))
+        new_pos = max(0, current_pos + seconds)
+        if duration > 0:
+            new_pos = min(new_pos, duration)
         
         was_playing = self.state == PlaybackState.PLAYING
         
         try:
-            pygame.mixer.music.load(self.current_song)
-            pygame.mixer.music.play(start=new_pos)
+            if self.state == PlaybackState.STOPPED or not self._set_pos(new_pos):
+                pygame.mixer.music.load(self.current_song)
+                pygame.mixer.music.play(start=new_pos)
+                self.queued_song = None
+                self._mixer_pos = 0
+                if not was_playing:
+                    pygame.mixer.music.pause()
             
             if was_playing:
                 self.state = PlaybackState.PLAYING
                 self.start_time = time.time() - new_pos
                 self.pause_time = 0
             else:
-                pygame.mixer.music.pause()
                 self.state = PlaybackState.PAUSED
                 self.pause_time = new_pos
         except Exception:
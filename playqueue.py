@@ -0,0 +1,103 @@
+class PlayQueue:
+    __slots__ = ('_items', '_members', '_positions', 'cursor', 'version')
+    
+    def __init__(self, paths=()):
+        self._items = []
+        self._members = set()
+        self._positions = {}
+        self.cursor = 0
+        self.version = 0
+        self.extend(paths)
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __bool__(self):
+        return bool(self._items)
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def __getitem__(self, idx):
+        return self._items[idx]
+    
+    def __contains__(self, path):
+        return path in self._members
+    
+    def add(self, path):
+        if path in self._members:
+            return False
+        if self._positions is not None:
+            self._positions[path] = len(self._items)
+        self._items.append(path)
+        self._members.add(path)
+        self.version += 1
+        return True
+    
+    def extend(self, paths):
+        added = 0
+        for path in paths:
+            if self.add(path):
+                added += 1
+        return added
+    
+    def index(self, path):
+        if path not in self._members:
+            return None
+        if self._positions is None:
+            self._positions = {p: idx for idx, p in enumerate(self._items)}
+        return self._positions[path]
+    
+    def remove_at(self, idx):
+        if idx < 0:
+            idx += len(self._items)
+        path = self._items.pop(idx)
+        self._members.discard(path)
+        if idx == len(self._items):
+            if self._positions is not None:
+                del self._positions[path]
+        else:
+            self._positions = None
+        if self.cursor > idx:
+            self.cursor -= 1
+        self.version += 1
+        return path
+    
+    def remove(self, path):
+        idx = self.index(path)
+        if idx is None:
+            return False
+        self.remove_at(idx)
+        return True
+    
+    def remap(self, func):
+        self._items = [func(item) for item in self._items]
+        self._members = set(self._items)
+        self._positions = None
+        self.version += 1
+    
+    def clear(self):
+        count = len(self._items)
+        self._items = []
+        self._members = set()
+        self._positions = {}
+        self.cursor = 0
+        self.version += 1
+        return count
+    
+    def has_next(self):
+        return self.cursor < len(self._items)
+    
+    def peek(self):
+        if self.cursor < len(self._items):
+            return self._items[self.cursor]
+        return None
+    
+    def advance(self):
+        path = self.peek()
+        if path is not None:
+            self.cursor += 1
+        return path
+    
+    def play_from(self, idx):
+        self.cursor = idx + 1
\ No newline at end of file
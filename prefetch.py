@@ -0,0 +1,73 @@
+import threading
+
+DEFAULT_PREFETCH_MB = 8
+PREFETCH_CHUNK = 256 * 1024
+PREFETCH_AHEAD = 3
+PREFETCH_REMEMBER = 32
+
+class Prefetcher:
+    __slots__ = ('limit', '_pending', '_warm', '_lock', '_wake', '_stop', '_thread')
+    
+    def __init__(self, size_mb=DEFAULT_PREFETCH_MB):
+        try:
+            self.limit = int(float(size_mb) * 1024 * 1024)
+        except (TypeError, ValueError):
+            self.limit = DEFAULT_PREFETCH_MB * 1024 * 1024
+        self._pending = []
+        self._warm = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+    
+    def request(self, paths):
+        if self.limit <= 0:
+            return
+        
+        with self._lock:
+            self._pending = [path for path in paths if path not in self._warm]
+        
+        if self._pending:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._wake.set()
+    
+    def is_warm(self, path):
+        return self.limit <= 0 or path in self._warm
+    
+    def stop(self):
+        self._stop = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _read(self, path, buf):
+        remaining = self.limit
+        try:
+            with open(path, "rb", buffering=0) as f:
+                while remaining > 0 and not self._stop:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    remaining -= n
+        except OSError:
+            pass
+    
+    def _run(self):
+        buf = bytearray(PREFETCH_CHUNK)
+        while not self._stop:
+            self._wake.wait()
+            with self._lock:
+                if not self._pending:
+                    self._wake.clear()
+                    continue
+                path = self._pending.pop(0)
+            
+            self._read(path, buf)
+            
+            with self._lock:
+                self._warm[path] = True
+                if len(self._warm) > PREFETCH_REMEMBER:
+                    del self._warm[next(iter(self._warm))]
\ No newline at end of file
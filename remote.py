@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import time
+import signal
+import threading
+from pathlib import Path
+from multiprocessing.connection import Listener, Client
+
+REMOTE_POLL = 0.2
+WAKE_RETRY = 0.05
+REPLY_TIMEOUT = 10.0
+MAX_REQUEST = 1 << 16
+
+def default_address():
+    if sys.platform == "win32":
+        return r"\\.\pipe\wmus-" + os.getenv("USERNAME", "")
+    return str(Path(os.getenv('LOCALAPPDATA')) / 'wmus' / 'remote.sock')
+
+def error_reply(message):
+    return json.dumps({"error": message}).encode("utf-8")
+
+def send_commands(commands, address=None):
+    with Client(address or default_address()) as conn:
+        conn.send_bytes("\n".join(commands).encode("utf-8"))
+        return json.loads(conn.recv_bytes().decode("utf-8"))
+
+def _wake_signal(signum, frame):
+    pass
+
+class RemoteRequest:
+    __slots__ = ('commands', 'reply', 'done')
+    
+    def __init__(self, commands):
+        self.commands = commands
+        self.reply = None
+        self.done = threading.Event()
+    
+    def finish(self, reply):
+        self.reply = reply
+        self.done.set()
+
+class RemoteServer:
+    __slots__ = ('address', 'waiting', '_listener', '_status', '_pending', '_lock', '_stop', '_thread', '_main')
+    
+    def __init__(self, address=None):
+        self.address = address or default_address()
+        self.waiting = False
+        self._listener = None
+        self._status = ({}, None)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._main = None
+    
+    @property
+    def can_wake(self):
+        return self._main is not None
+    
+    def start(self):
+        if sys.platform != "win32":
+            path = Path(self.address)
+            if path.exists():
+                try:
+                    Client(self.address).close()
+                except OSError:
+                    path.unlink()
+                else:
+                    raise OSError(f"another wmus is listening on {self.address}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if sys.platform == "win32":
+            self._listener = Listener(self.address)
+        else:
+            umask = os.umask(0o077)
+            try:
+                self._listener = Listener(self.address)
+            finally:
+                os.umask(umask)
+        if hasattr(signal, "pthread_kill"):
+            signal.signal(signal.SIGUSR1, _wake_signal)
+            self._main = threading.main_thread().ident
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._listener is None:
+            return
+        try:
+            Client(self.address).close()
+        except OSError:
+            pass
+        self._thread.join()
+        self._thread = None
+        self._listener.close()
+        self._listener = None
+        for request in self.take():
+            request.finish(error_reply("wmus is shutting down"))
+    
+    def take(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+    
+    def publish(self, status, started=None):
+        self._status = (status, started)
+    
+    def status(self):
+        status, started = self._status
+        if started is not None:
+            status = dict(status, position=int(time.time() - started))
+        return status
+    
+    def reply(self, results):
+        return json.dumps({"results": results, "status": self.status()}).encode("utf-8")
+    
+    def _wake_main(self):
+        if self._main is not None and self.waiting:
+            signal.pthread_kill(self._main, signal.SIGUSR1)
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                continue
+            if self._stop.is_set():
+                conn.close()
+                break
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+    
+    def _serve(self, conn):
+        with conn:
+            try:
+                data = conn.recv_bytes(MAX_REQUEST)
+            except (OSError, EOFError):
+                return
+            
+            commands = [line.strip() for line in data.decode("utf-8", "replace").splitlines() if line.strip()]
+            if all(command == "status" for command in commands):
+                reply = self.reply([{"command": command, "ok": True, "message": ""} for command in commands])
+            else:
+                reply = self._forward(commands)
+            
+            try:
+                conn.send_bytes(reply)
+            except OSError:
+                pass
+    
+    def _forward(self, commands):
+        request = RemoteRequest(commands)
+        with self._lock:
+            self._pending.append(request)
+        
+        deadline = time.monotonic() + REPLY_TIMEOUT
+        self._wake_main()
+        while not request.done.wait(WAKE_RETRY):
+            if self._stop.is_set() or time.monotonic() > deadline:
+                return error_reply("wmus did not answer")
+            self._wake_main()
+        return request.reply
\ No newline at end of file
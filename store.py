@@ -0,0 +1,304 @@
+import json
+import sqlite3
+from library import LibraryTable
+from catalog import Catalog
+from helpers import get_folder_hash
+
+CACHE_VERSION = "1.5"
+SQLITE_SCHEMA_VERSION = 5
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS albums (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    artist_id INTEGER REFERENCES artists(id),
+    UNIQUE (title, artist_id)
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tracks (
+    dir_id INTEGER NOT NULL REFERENCES dirs(id),
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    album_id INTEGER REFERENCES albums(id),
+    artist_id INTEGER REFERENCES artists(id),
+    album_artist_id INTEGER REFERENCES artists(id),
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    PRIMARY KEY (dir_id, file)
+);
+CREATE INDEX IF NOT EXISTS tracks_album ON tracks(album_id);
+CREATE INDEX IF NOT EXISTS tracks_artist ON tracks(artist_id);
+"""
+
+class JsonStore:
+    __slots__ = ('path', 'root', '_albums')
+    
+    def __init__(self, path, root=""):
+        self.path = path
+        self.root = root
+        self._albums = None
+    
+    def load(self):
+        if not self.path.exists():
+            return None
+        
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+        
+        if cache.get("version") != CACHE_VERSION:
+            return None
+        
+        try:
+            library = LibraryTable(self.root)
+            dirs = [library.add_dir(directory) for directory in cache["dirs"]]
+            strings = cache["strings"]
+            add_file = library.add_file
+            tracks = [
+                add_file(dirs[did], filename, name, duration, strings[album], strings[artist], size, mtime, strings[album_artist])
+                for did, filename, name, duration, album, artist, size, mtime, album_artist in cache["tracks"]
+            ]
+            self._albums = (tracks, strings, cache["albums"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        return tracks, library
+    
+    def load_catalog(self, library):
+        if self._albums is None:
+            return None
+        tracks, strings, albums = self._albums
+        self._albums = None
+        
+        try:
+            catalog = Catalog(library)
+            intern = library.intern
+            for artist, title, rows in albums:
+                aid = catalog.album_id(intern(strings[artist]), intern(strings[title]))
+                catalog.set_album(aid, [tracks[row] for row in rows])
+        except (IndexError, TypeError, ValueError):
+            return None
+        return catalog
+    
+    def save(self, playlist, library, catalog):
+        dirs = {}
+        strings = {"": 0}
+        
+        def string_id(text):
+            sid = strings.get(text)
+            if sid is None:
+                sid = strings[text] = len(strings)
+            return sid
+        
+        rows = {}
+        tracks = []
+        for track in playlist:
+            did = library.dir_ids[track]
+            if did not in dirs:
+                dirs[did] = len(dirs)
+            rows[track] = len(tracks)
+            tracks.append((
+                dirs[did], library.files[track], library.names[track], library.durations[track],
+                string_id(library.album(track)), string_id(library.artist(track)),
+                library.sizes[track], library.mtimes[track], string_id(library.album_artist(track))
+            ))
+        
+        albums = [
+            (string_id(catalog.album_artist(aid)), string_id(catalog.album_title(aid)), [rows[track] for track in songs])
+            for aid, songs in enumerate(catalog.albums) if songs
+        ]
+        
+        cache_data = {
+            "version": CACHE_VERSION,
+            "dirs": [library.dirs[did] for did in dirs],
+            "strings": list(strings),
+            "tracks": tracks,
+            "albums": albums
+        }
+        
+        self._albums = None
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(cache_data, f)
+        except IOError:
+            pass
+    
+    def update(self, playlist, library, catalog, changed, removed):
+        self.save(playlist, library, catalog)
+    
+    def clear(self):
+        self._albums = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+class SqliteStore:
+    __slots__ = ('path', 'root', '_conn')
+    
+    def __init__(self, path, root=""):
+        self.path = path
+        self.root = root
+        self._conn = None
+    
+    def _connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA synchronous = NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SQLITE_SCHEMA_VERSION:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS tracks;"
+                    "DROP TABLE IF EXISTS dirs;"
+                    "DROP TABLE IF EXISTS albums;"
+                    "DROP TABLE IF EXISTS artists;"
+                )
+                conn.executescript(SQLITE_SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    def load(self):
+        if not self.path.exists():
+            return None
+        
+        try:
+            conn = self._connect()
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SQLITE_SCHEMA_VERSION:
+                return None
+            
+            dirs = conn.execute("SELECT id, path FROM dirs").fetchall()
+            rows = conn.execute(
+                "SELECT t.dir_id, t.file, t.name, t.duration, al.title, ar.name, t.size, t.mtime, aa.name "
+                "FROM tracks t "
+                "LEFT JOIN albums al ON al.id = t.album_id "
+                "LEFT JOIN artists ar ON ar.id = t.artist_id "
+                "LEFT JOIN artists aa ON aa.id = t.album_artist_id"
+            ).fetchall()
+        except sqlite3.Error:
+            return None
+        
+        library = LibraryTable(self.root)
+        dir_ids = {did: library.add_dir(directory) for did, directory in dirs}
+        for did, filename, name, duration, album, artist, size, mtime, album_artist in rows:
+            library.add_file(dir_ids[did], filename, name, duration, album, artist or "", size, mtime, album_artist or "")
+        return sorted(library, key=library.path), library
+    
+    def load_catalog(self, library):
+        try:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT t.album_id, d.path, t.file FROM tracks t JOIN dirs d ON d.id = t.dir_id"
+            ).fetchall()
+        except sqlite3.Error:
+            return None
+        
+        albums = {}
+        dir_ids = {}
+        for album_id, directory, filename in rows:
+            did = dir_ids.get(directory)
+            if did is None:
+                did = dir_ids[directory] = library.add_dir(directory)
+            track = library.find_file(did, filename)
+            if track is None:
+                return None
+            if album_id not in albums:
+                albums[album_id] = []
+            albums[album_id].append(track)
+        
+        catalog = Catalog(library)
+        for tracks in albums.values():
+            tracks.sort(key=library.path)
+            track = tracks[0]
+            catalog.set_album(catalog.album_id(library.album_artist_id(track), library.album_ids[track]), tracks)
+        return catalog
+    
+    def _write_tracks(self, conn, library, paths):
+        dir_ids = {}
+        album_ids = {}
+        artist_ids = {}
+        
+        def lookup(table, columns, values, ids):
+            if values not in ids:
+                where = " AND ".join(f"{column} = ?" for column in columns)
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(values))})",
+                    values
+                )
+                ids[values] = conn.execute(f"SELECT id FROM {table} WHERE {where}", values).fetchone()[0]
+            return ids[values]
+        
+        rows = []
+        for path in paths:
+            track = library.find(path)
+            artist_id = lookup("artists", ("name",), (library.artist(track),), artist_ids)
+            album_artist_id = lookup("artists", ("name",), (library.album_artist(track),), artist_ids)
+            album_owner = album_artist_id if library.album_artist_ids[track] else artist_id
+            rows.append((
+                lookup("dirs", ("path",), (library.dirs[library.dir_ids[track]],), dir_ids),
+                library.files[track], library.names[track], library.durations[track],
+                lookup("albums", ("title", "artist_id"), (library.album(track), album_owner), album_ids),
+                artist_id, album_artist_id, library.sizes[track], library.mtimes[track]
+            ))
+        conn.executemany("INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    
+    def _delete_tracks(self, conn, library, paths):
+        conn.executemany(
+            "DELETE FROM tracks WHERE dir_id = (SELECT id FROM dirs WHERE path = ?) AND file = ?",
+            (library.split(path) for path in paths)
+        )
+    
+    def save(self, playlist, library, catalog):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM tracks")
+                conn.execute("DELETE FROM dirs")
+                conn.execute("DELETE FROM albums")
+                conn.execute("DELETE FROM artists")
+                self._write_tracks(conn, library, [library.path(track) for track in playlist])
+                conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+        except sqlite3.Error:
+            pass
+    
+    def update(self, playlist, library, catalog, changed, removed):
+        try:
+            conn = self._connect()
+            with conn:
+                self._delete_tracks(conn, library, removed)
+                self._write_tracks(conn, library, changed)
+                conn.execute("DELETE FROM dirs WHERE id NOT IN (SELECT dir_id FROM tracks)")
+                conn.execute(
+                    "DELETE FROM albums WHERE id NOT IN "
+                    "(SELECT album_id FROM tracks WHERE album_id IS NOT NULL)"
+                )
+                conn.execute(
+                    "DELETE FROM artists WHERE id NOT IN "
+                    "(SELECT artist_id FROM tracks WHERE artist_id IS NOT NULL "
+                    "UNION SELECT album_artist_id FROM tracks WHERE album_artist_id IS NOT NULL)"
+                )
+                conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+        except sqlite3.Error:
+            pass
+    
+    def clear(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+def open_store(cache_dir, folder, backend="json"):
+    key = get_folder_hash(folder)
+    if backend == "sqlite":
+        return SqliteStore(cache_dir / f"library_{key}.db", folder)
+    return JsonStore(cache_dir / f"playlist_cache_{key}.json", folder)
\ No newline at end of file
@@ -26,10 +26,13 @@ class UI:
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.max_y, self.max_x = stdscr.getmaxyx()
-        self.last_render = 0
         self.colors_initialized = False
         self.message_display_time = 0.0
         self.message_duration = 3.0
+        self.rows = {}
+        self.frame = {}
+        self.content_rows = {}
+        self.content_key = None
         self._init_colors()
     
     def _init_colors(self):
@@ -50,46 +53,112 @@ class UI:
             return text[:width - 2] + "…"
         return text
     
+    def invalidate(self):
+        self.rows = {}
+        self.content_rows = {}
+        self.content_key = None
+        try:
+            self.stdscr.clear()
+        except curses.error:
+            pass
+    
+    def _put(self, y, x, text, pair):
+        if y not in self.frame:
+            self.frame[y] = []
+        self.frame[y].append((x, text, pair))
+    
+    def _flush(self):
+        dirty = False
+        for y in set(self.rows) | set(self.frame):
+            segments = self.frame.get(y, [])
+            if self.rows.get(y) == segments:
+                continue
+            dirty = True
+            try:
+                self.stdscr.move(y, 0)
+                self.stdscr.clrtoeol()
+            except curses.error:
+                pass
+            for x, text, pair in segments:
+                try:
+                    self.stdscr.addstr(y, x, text, curses.color_pair(pair))
+                except curses.error:
+                    pass
+        
+        self.rows = self.frame
+        self.frame = {}
+        return dirty
+    
+    def _content_key(self, cli, search_state, search_mode):
+        if cli.view_mode in (2, 4):
+            return (
+                cli.view_mode, self.max_y, self.max_x, cli.library_version,
+                cli.album_view_selected, cli.scroll_offset, cli.album_songs_scroll,
+                cli.album_song_selected, cli.album_column, cli.current_track
+            )
+        search = None
+        if search_mode and search_state.filtered_indices:
+            search = (search_state.results_query, search_state.results_key, search_state.selected)
+        return (
+            1, self.max_y, self.max_x, cli._display_key(), cli.selected_index,
+            cli.scroll_offset, cli.current_track, search
+        )
+    
     def render(self, cli, quit_prompt, search_state, command_state):
         now = time.time()
-        if now - self.last_render > 0.016:
-            self.max_y, self.max_x = self.stdscr.getmaxyx()
-            
-            if cli.error_message and self.message_display_time > 0:
-                if now - self.message_display_time > self.message_duration:
-                    cli.error_message = ""
-                    self.message_display_time = 0.0
-            
-            if quit_prompt:
-                command_input = "Quit wmus? (y/n)"
-                search_mode = False
-            elif command_state.active:
-                command_input = command_state.buffer
-                search_mode = False
-            elif search_state.active:
-                command_input = f"/{search_state.query}"
-                search_mode = True
-            else:
-                command_input = ""
-                search_mode = False
-            
-            self._render_top_bar(cli)
+        max_y, max_x = self.stdscr.getmaxyx()
+        if (max_y, max_x) != (self.max_y, self.max_x):
+            self.max_y, self.max_x = max_y, max_x
+            self.invalidate()
+        
+        if self.message_display_time > 0:
+            if not cli.error_message:
+                self.message_display_time = 0.0
+            elif now - self.message_display_time > self.message_duration:
+                cli.error_message = ""
+                self.message_display_time = 0.0
+        
+        if quit_prompt:
+            command_input = "Quit wmus? (y/n)"
+            search_mode = False
+        elif command_state.active:
+            command_input = command_state.buffer
+            search_mode = False
+        elif search_state.active:
+            command_input = f"/{search_state.query}"
+            search_mode = True
+        else:
+            command_input = ""
+            search_mode = False
+        
+        self._render_top_bar(cli)
+        
+        content_key = self._content_key(cli, search_state, search_mode)
+        if content_key == self.content_key:
+            self.frame.update(self.content_rows)
+        else:
             self._render_content(cli, search_state, search_mode)
-            self._render_status_bar(cli, command_input, search_mode, search_state)
-            
+            self.content_key = self._content_key(cli, search_state, search_mode)
+            self.content_rows = {y: self.frame[y] for y in range(1, self.max_y - 3) if y in self.frame}
+        
+        if cli.stats is not None:
+            self._render_stats(cli, search_state)
+        
+        self._render_status_bar(cli, command_input, search_mode, search_state)
+        
+        if self._flush():
             try:
-                self.stdscr.refresh()
+                self.stdscr.noutrefresh()
+                curses.doupdate()
             except curses.error:
                 pass
-            
-            self.last_render = now
     
     def _render_top_bar(self, cli):
         now_playing = ""
         status_icon = SYMBOLS["stop"]
         
-        if cli.current_song_path and cli.current_song_path in cli.song_cache:
-            cache = cli.song_cache[cli.current_song_path]
+        if cli.current_track is not None:
+            cache = cli.library.song(cli.current_track)
             pos_seconds = cli.player.get_pos()
             pos_min, pos_sec = divmod(pos_seconds, 60)
             
@@ -128,17 +197,12 @@ class UI:
         else:
             now_playing = f"{status_icon} No track playing"
         
-        self.stdscr.attron(curses.color_pair(1))
-        try:
-            self.stdscr.addstr(0, 0, (" " + now_playing)[:self.max_x].ljust(self.max_x))
-        except curses.error:
-            pass
-        self.stdscr.attroff(curses.color_pair(1))
+        self._put(0, 0, (" " + now_playing)[:self.max_x].ljust(self.max_x), 1)
     
     def _render_content(self, cli, search_state, search_mode):
         max_songs = max(0, self.max_y - 4)
         
-        if cli.view_mode == 2:
+        if cli.view_mode in (2, 4):
             self._render_album_view(cli, max_songs)
         else:
             self._render_list_view(cli, max_songs, search_state, search_mode)
@@ -148,7 +212,7 @@ class UI:
         current_songs = cli._get_current_songs()
         
         if search_mode and search_state.filtered_indices:
-            filtered = [display_list[i] for i in search_state.filtered_indices if i < len(display_list)]
+            filtered = search_state.filtered_indices
             selected = search_state.selected
             
             if selected < cli.scroll_offset:
@@ -156,30 +220,17 @@ class UI:
             elif selected >= cli.scroll_offset + max_songs:
                 cli.scroll_offset = selected - max_songs + 1
             
-            visible = filtered[cli.scroll_offset:cli.scroll_offset + max_songs]
-            
-            for i in range(max_songs):
-                try:
-                    self.stdscr.move(1 + i, 0)
-                    self.stdscr.clrtoeol()
-                except curses.error:
-                    pass
+            visible = [display_list[i] for i in filtered[cli.scroll_offset:cli.scroll_offset + max_songs]
+                       if i < len(display_list)]
             
             for i, name in enumerate(visible):
                 idx = cli.scroll_offset + i
-                try:
-                    if idx == selected:
-                        self.stdscr.attron(curses.color_pair(2))
-                        display_name = self._truncate_text(name, self.max_x - 3)
-                        self.stdscr.addstr(1 + i, 0, (f" {SYMBOLS['pointer']} {display_name}").ljust(self.max_x))
-                        self.stdscr.attroff(curses.color_pair(2))
-                    else:
-                        self.stdscr.attron(curses.color_pair(5))
-                        display_name = self._truncate_text(name, self.max_x - 4)
-                        self.stdscr.addstr(1 + i, 0, (f"   {display_name}").ljust(self.max_x))
-                        self.stdscr.attroff(curses.color_pair(5))
-                except curses.error:
-                    pass
+                if idx == selected:
+                    display_name = self._truncate_text(name, self.max_x - 3)
+                    self._put(1 + i, 0, (f" {SYMBOLS['pointer']} {display_name}").ljust(self.max_x), 2)
+                else:
+                    display_name = self._truncate_text(name, self.max_x - 4)
+                    self._put(1 + i, 0, (f"   {display_name}").ljust(self.max_x), 5)
         else:
             selected = cli.selected_index
             
@@ -190,21 +241,14 @@ class UI:
             
             visible = display_list[cli.scroll_offset:cli.scroll_offset + max_songs]
             
-            for i in range(max_songs):
-                try:
-                    self.stdscr.move(1 + i, 0)
-                    self.stdscr.clrtoeol()
-                except curses.error:
-                    pass
-            
             for i, name in enumerate(visible):
                 idx = cli.scroll_offset + i
                 
                 if idx < len(current_songs):
                     song = current_songs[idx]
-                    timestamp = cli.song_cache[song].timestamp if song in cli.song_cache else "--:--"
+                    timestamp = cli.library.timestamp(song)
                     
-                    is_playing = (idx < len(current_songs) and current_songs[idx] == cli.current_song_path)
+                    is_playing = (idx < len(current_songs) and current_songs[idx] == cli.current_track)
                     play_icon = SYMBOLS["music"] if is_playing else " "
                     
                     if cli.view_mode == 3:
@@ -224,30 +268,20 @@ class UI:
                     display_name = self._truncate_text(name, self.max_x - 4)
                     display_text = f"   {display_name}"
                 
-                try:
-                    if idx == selected:
-                        self.stdscr.attron(curses.color_pair(2))
-                        self.stdscr.addstr(1 + i, 0, (f" {SYMBOLS['pointer']}" + display_text[2:]).ljust(self.max_x))
-                        self.stdscr.attroff(curses.color_pair(2))
-                    elif idx < len(current_songs) and current_songs[idx] == cli.current_song_path:
-                        self.stdscr.attron(curses.color_pair(3))
-                        self.stdscr.addstr(1 + i, 0, display_text[:self.max_x].ljust(self.max_x))
-                        self.stdscr.attroff(curses.color_pair(3))
-                    else:
-                        self.stdscr.attron(curses.color_pair(5))
-                        self.stdscr.addstr(1 + i, 0, display_text[:self.max_x].ljust(self.max_x))
-                        self.stdscr.attroff(curses.color_pair(5))
-                except curses.error:
-                    pass
+                if idx == selected:
+                    self._put(1 + i, 0, (f" {SYMBOLS['pointer']}" + display_text[2:]).ljust(self.max_x), 2)
+                elif idx < len(current_songs) and current_songs[idx] == cli.current_track:
+                    self._put(1 + i, 0, display_text[:self.max_x].ljust(self.max_x), 3)
+                else:
+                    self._put(1 + i, 0, display_text[:self.max_x].ljust(self.max_x), 5)
     
     def _render_album_view(self, cli, max_songs):
         left_width = max(15, self.max_x // 2 - 1)
         separator_x = left_width + 1
         right_width = self.max_x - separator_x - 1
         
-        album_names = cli.album_names
-        selected_album = album_names[cli.album_view_selected] if album_names else None
-        album_songs = cli.albums.get(selected_album, []) if selected_album else []
+        album_names = cli._groups()
+        album_songs = cli._group_tracks(cli.album_view_selected)
         
         if cli.album_column == 0:
             if cli.album_view_selected < cli.scroll_offset:
@@ -261,53 +295,29 @@ class UI:
                 cli.album_songs_scroll = cli.album_song_selected - max_songs + 1
         
         for i in range(max_songs):
-            try:
-                self.stdscr.move(1 + i, 0)
-                self.stdscr.clrtoeol()
-            except curses.error:
-                pass
-            
             idx = cli.scroll_offset + i
             if idx < len(album_names):
                 album = album_names[idx]
-                track_count = len(cli.albums[album])
-                album_text = f"{album} ({track_count})"
+                album_text = f"{cli._group_label(album)} ({cli._group_count(album)})"
                 album_display = self._truncate_text(album_text, left_width - 2)
                 
-                try:
-                    if idx == cli.album_view_selected and cli.album_column == 0:
-                        self.stdscr.attron(curses.color_pair(2))
-                        self.stdscr.addstr(1 + i, 0, (f" {SYMBOLS['pointer']} {album_display}").ljust(left_width))
-                        self.stdscr.attroff(curses.color_pair(2))
-                    else:
-                        self.stdscr.attron(curses.color_pair(5))
-                        self.stdscr.addstr(1 + i, 0, (f"   {album_display}").ljust(left_width))
-                        self.stdscr.attroff(curses.color_pair(5))
-                except curses.error:
-                    pass
+                if idx == cli.album_view_selected and cli.album_column == 0:
+                    self._put(1 + i, 0, (f" {SYMBOLS['pointer']} {album_display}").ljust(left_width), 2)
+                else:
+                    self._put(1 + i, 0, (f"   {album_display}").ljust(left_width), 5)
             else:
-                try:
-                    self.stdscr.attron(curses.color_pair(5))
-                    self.stdscr.addstr(1 + i, 0, " " * left_width)
-                    self.stdscr.attroff(curses.color_pair(5))
-                except curses.error:
-                    pass
+                self._put(1 + i, 0, " " * left_width, 5)
             
-            try:
-                self.stdscr.attron(curses.color_pair(9))
-                self.stdscr.addstr(1 + i, separator_x, SYMBOLS["separator"])
-                self.stdscr.attroff(curses.color_pair(9))
-            except curses.error:
-                pass
+            self._put(1 + i, separator_x, SYMBOLS["separator"], 9)
         
         for i in range(max_songs):
             song_idx = cli.album_songs_scroll + i
             if song_idx < len(album_songs):
                 song = album_songs[song_idx]
-                name = cli.song_cache[song].name if song in cli.song_cache else os.path.basename(song)
-                timestamp = cli.song_cache[song].timestamp if song in cli.song_cache else "--:--"
+                name = cli.library.name(song)
+                timestamp = cli.library.timestamp(song)
                 
-                is_playing = song == cli.current_song_path
+                is_playing = song == cli.current_track
                 play_icon = SYMBOLS["music"] if is_playing else " "
                 
                 song_display = self._truncate_text(name, right_width - len(timestamp) - 5)
@@ -316,24 +326,51 @@ class UI:
                 if padding > 0:
                     song_text = f"{song_text}{' ' * padding}{timestamp} "
                 
-                try:
-                    if song_idx == cli.album_song_selected and cli.album_column == 1:
-                        self.stdscr.attron(curses.color_pair(2))
-                        self.stdscr.addstr(1 + i, separator_x + 1, (f" {SYMBOLS['pointer']}" + song_text[1:]).ljust(right_width))
-                        self.stdscr.attroff(curses.color_pair(2))
-                    elif is_playing:
-                        self.stdscr.attron(curses.color_pair(3))
-                        self.stdscr.addstr(1 + i, separator_x + 1, song_text[:right_width].ljust(right_width))
-                        self.stdscr.attroff(curses.color_pair(3))
-                    else:
-                        self.stdscr.attron(curses.color_pair(5))
-                        self.stdscr.addstr(1 + i, separator_x + 1, ("  " + song_text[2:])[:right_width].ljust(right_width))
-                        self.stdscr.attroff(curses.color_pair(5))
-                except curses.error:
-                    pass
+                if song_idx == cli.album_song_selected and cli.album_column == 1:
+                    self._put(1 + i, separator_x + 1, (f" {SYMBOLS['pointer']}" + song_text[1:]).ljust(right_width), 2)
+                elif is_playing:
+                    self._put(1 + i, separator_x + 1, song_text[:right_width].ljust(right_width), 3)
+                else:
+                    self._put(1 + i, separator_x + 1, ("  " + song_text[2:])[:right_width].ljust(right_width), 5)
+    
+    def _render_stats(self, cli, search_state):
+        stats = cli.stats
+        lines = [
+            "Performance (:stats to close)",
+            f"Render   p50 {stats.render_percentile(0.5) * 1000:.2f} ms  p99 {stats.render_percentile(0.99) * 1000:.2f} ms",
+            f"Wakeups  {cli.wakeup_meter.rate:.1f}/s",
+        ]
+        
+        if cli.scanner is not None:
+            lines.append(f"Scan     running, {cli.scanner.scanned}/{cli.scanner.found} files")
+        elif cli.last_scan is not None:
+            elapsed, files = cli.last_scan
+            lines.append(f"Scan     {elapsed:.2f} s, {files / max(elapsed, 0.001):.0f} files/s")
+        else:
+            lines.append("Scan     --")
+        
+        if cli.cache_load_time is not None:
+            lines.append(f"Cache    loaded in {cli.cache_load_time * 1000:.1f} ms")
+        else:
+            lines.append("Cache    not loaded")
+        
+        if stats.search_time is not None and search_state.active:
+            lines.append(f"Search   {stats.search_time * 1000:.2f} ms for '{stats.search_query}'")
+        else:
+            lines.append("Search   --")
+        
+        lines.append(f"Memory   {stats.library_memory(cli) / 1048576:.1f} MB for {len(cli.library)} tracks")
+        
+        width = min(self.max_x, max(len(line) for line in lines) + 2)
+        x = self.max_x - width
+        for i, line in enumerate(lines):
+            y = 1 + i
+            if y >= self.max_y - 3:
+                break
+            self.frame[y] = self.frame.get(y, []) + [(x, self._truncate_text(f" {line}", width + 1).ljust(width), 1)]
     
     def _render_status_bar(self, cli, command_input="", search_mode=False, search_state=None):
-        view_names = {1: "Library", 2: "Albums", 3: "Queue"}
+        view_names = {1: "Library", 2: "Albums", 3: "Queue", 4: "Artists"}
         view_name = view_names.get(cli.view_mode, "Library")
         
         shuffle_status = "Shuffle: ON" if cli.shuffle else "Shuffle: OFF"
@@ -345,75 +382,59 @@ class UI:
             total_count = len(cli._get_display_list())
             search_info = f" | {match_count}/{total_count} matches"
         
-        left_status = f" {view_name} | {len(cli._get_current_songs())} tracks | {shuffle_status} | {repeat_status}{search_info}"
+        scan_info = ""
+        if cli.scanner is not None:
+            scan_info = f" | Scanning {cli.scanner.scanned}/{cli.scanner.found}"
+        if cli.show_wakeups:
+            scan_info += f" | Wakeups: {cli.wakeup_meter.rate:.1f}/s"
         
-        try:
-            self.stdscr.attron(curses.color_pair(6))
-            self.stdscr.addstr(self.max_y - 3, 0, left_status[:self.max_x].ljust(self.max_x))
-            self.stdscr.attroff(curses.color_pair(6))
-        except curses.error:
-            pass
+        left_status = f" {view_name} | {len(cli._get_current_songs())} tracks | {shuffle_status} | {repeat_status}{search_info}{scan_info}"
+        
+        self._put(self.max_y - 3, 0, left_status[:self.max_x].ljust(self.max_x), 6)
         
         if command_input:
-            try:
-                if search_mode:
-                    label = " Search: "
-                else:
-                    label = " Command: "
-                self.stdscr.attron(curses.color_pair(1))
-                self.stdscr.addstr(self.max_y - 2, 0, (label + command_input)[:self.max_x].ljust(self.max_x))
-                self.stdscr.attroff(curses.color_pair(1))
-            except curses.error:
-                pass
+            if search_mode:
+                label = " Search: "
+            else:
+                label = " Command: "
+            self._put(self.max_y - 2, 0, (label + command_input)[:self.max_x].ljust(self.max_x), 1)
         elif cli.error_message:
             is_success = (cli.error_message.startswith("Added") or 
                          cli.error_message.startswith("Loaded") or 
                          cli.error_message.startswith("Refreshed") or 
+                         cli.error_message.startswith("Scanning") or 
+                         cli.error_message.startswith("Library updated") or 
                          cli.error_message.startswith("Cleared") or 
                          "ON" in cli.error_message or 
                          "OFF" in cli.error_message or 
                          cli.error_message.startswith("Seeked") or 
+                         cli.error_message.startswith("Info:") or 
                          cli.error_message.startswith("Volume:") or 
                          cli.error_message.startswith("Fading"))
             
             if is_success:
-                self.stdscr.attron(curses.color_pair(8))
+                pair = 8
                 icon = "✓" if UNICODE_SUPPORT else "+"
             else:
-                self.stdscr.attron(curses.color_pair(4))
+                pair = 4
                 icon = "✗" if UNICODE_SUPPORT else "!"
             
-            try:
-                message = self._truncate_text(cli.error_message, self.max_x - 4)
-                self.stdscr.addstr(self.max_y - 2, 0, (f" {icon} {message}").ljust(self.max_x))
-            except curses.error:
-                pass
-            
-            self.stdscr.attroff(curses.color_pair(8))
-            self.stdscr.attroff(curses.color_pair(4))
+            message = self._truncate_text(cli.error_message, self.max_x - 4)
+            self._put(self.max_y - 2, 0, (f" {icon} {message}").ljust(self.max_x), pair)
             
             if self.message_display_time == 0:
                 self.message_display_time = time.time()
         else:
-            try:
-                self.stdscr.attron(curses.color_pair(7))
-                self.stdscr.addstr(self.max_y - 2, 0, "".ljust(self.max_x))
-                self.stdscr.attroff(curses.color_pair(7))
-            except curses.error:
-                pass
+            self._put(self.max_y - 2, 0, "".ljust(self.max_x), 7)
         
-        help_line = " [c]Play/Pause [n]Next [p]Prev [/]Search [1]Library [2]Albums [3]Queue [:help]"
-        try:
-            self.stdscr.attron(curses.color_pair(7))
-            self.stdscr.addstr(self.max_y - 1, 0, help_line[:self.max_x].ljust(self.max_x))
-            self.stdscr.attroff(curses.color_pair(7))
-        except curses.error:
-            pass
+        help_line = " [c]Play/Pause [n]Next [p]Prev [/]Search [1]Library [2]Albums [3]Queue [4]Artists [:help]"
+        self._put(self.max_y - 1, 0, help_line[:self.max_x].ljust(self.max_x), 7)
     
     def show_help(self, keybindings):
         help_msg = help_text(keybindings)
         lines = help_msg.splitlines()
         scroll_pos = 0
+        self.stdscr.timeout(-1)
         
         while True:
             self.stdscr.clear()
@@ -450,6 +471,8 @@ class UI:
                 scroll_pos = min(scroll_pos + max_lines, max(0, len(lines) - max_lines))
             elif key == curses.KEY_PPAGE:
                 scroll_pos = max(scroll_pos - max_lines, 0)
+        
+        self.invalidate()
     
     def show_version(self):
         from main import APP_VERSION
@@ -463,4 +486,5 @@ class UI:
         self.stdscr.refresh()
         self.stdscr.nodelay(False)
         self.stdscr.getch()
-        self.stdscr.nodelay(True)
\ No newline at end of file
+        self.stdscr.nodelay(True)
+        self.invalidate()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import os
+import time
+import threading
+from library import DEFAULT_SCAN_WORKERS, list_music_dir, scan_songs
+
+DEFAULT_WATCH_INTERVAL = 2.0
+DEEP_CHECK_EVERY = 150
+MAX_SETTLE_TIME = 30.0
+
+class LibraryWatcher:
+    __slots__ = (
+        'root', 'interval', 'workers', '_library', '_current', '_dirs', '_dir_files',
+        '_touched', '_changes', '_first_touch', '_polls', '_stop', '_lock', '_ready', '_thread'
+    )
+    
+    def __init__(self, root, known, interval=DEFAULT_WATCH_INTERVAL, workers=DEFAULT_SCAN_WORKERS):
+        self.root = root
+        self.interval = interval
+        self.workers = workers
+        self._library = known
+        self._current = {}
+        self._dirs = {}
+        self._dir_files = {}
+        self._touched = set()
+        self._changes = 0
+        self._first_touch = 0.0
+        self._polls = 0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._ready = []
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def take(self):
+        with self._lock:
+            ready, self._ready = self._ready, []
+        return ready
+    
+    def _list_dir(self, directory):
+        listing = list_music_dir(directory)
+        if listing is None:
+            return None, []
+        files, subdirs = listing
+        return {path: (size, mtime) for path, size, mtime in files}, subdirs
+    
+    def _add_tree(self, directory):
+        stack = [directory]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            files, subdirs = self._list_dir(directory)
+            if files is None:
+                continue
+            self._dirs[directory] = mtime
+            self._set_dir_files(directory, files)
+            stack.extend(d for d in subdirs if d not in self._dirs)
+    
+    def _set_dir_files(self, directory, files):
+        for path in self._dir_files.get(directory, ()):
+            if path not in files:
+                del self._current[path]
+                self._touch(path)
+        
+        for path, stat in files.items():
+            if self._current.get(path) != stat:
+                self._current[path] = stat
+                self._touch(path)
+        
+        self._dir_files[directory] = set(files)
+    
+    def _touch(self, path):
+        self._touched.add(path)
+        self._changes += 1
+    
+    def _drop_dir(self, directory):
+        del self._dirs[directory]
+        for path in self._dir_files.pop(directory, ()):
+            del self._current[path]
+            self._touch(path)
+    
+    def _poll(self):
+        for directory, mtime in list(self._dirs.items()):
+            if directory not in self._dirs:
+                continue
+            try:
+                new_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._drop_dir(directory)
+                continue
+            if new_mtime == mtime:
+                continue
+            
+            files, subdirs = self._list_dir(directory)
+            if files is None:
+                self._drop_dir(directory)
+                continue
+            self._dirs[directory] = new_mtime
+            self._set_dir_files(directory, files)
+            for subdir in subdirs:
+                if subdir not in self._dirs:
+                    self._add_tree(subdir)
+        
+        self._polls += 1
+        if self._polls % DEEP_CHECK_EVERY == 0:
+            self._check_files(list(self._current))
+    
+    def _check_files(self, paths):
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stat = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+            if path in self._current and self._current[path] != stat:
+                self._current[path] = stat
+                self._touch(path)
+    
+    def _settle(self):
+        changed = []
+        removed = []
+        for path in self._touched:
+            stat = self._current.get(path)
+            if stat is None:
+                if path in self._library:
+                    removed.append(path)
+            elif self._library.get(path) != stat:
+                changed.append(path)
+        
+        self._touched = set()
+        self._first_touch = 0.0
+        
+        if not changed and not removed:
+            return
+        
+        scanned = []
+        for song, cache in scan_songs(((song,) + self._current[song] for song in changed), self.workers):
+            if self._stop.is_set():
+                return
+            scanned.append((song, cache))
+            self._library[song] = (cache.size, cache.mtime)
+        for song in removed:
+            del self._library[song]
+        
+        with self._lock:
+            self._ready.append((scanned, removed))
+    
+    def _run(self):
+        self._add_tree(self.root)
+        for path in self._library:
+            if path not in self._current:
+                self._touch(path)
+        
+        while not self._stop.wait(self.interval):
+            changes = self._changes
+            self._poll()
+            
+            if not self._touched:
+                continue
+            
+            if not self._first_touch:
+                self._first_touch = time.monotonic()
+            
+            self._check_files([
+                path for path in self._touched
+                if path in self._current and self._library.get(path) != self._current[path]
+            ])
+            
+            if self._changes == changes or time.monotonic() - self._first_touch > MAX_SETTLE_TIME:
+                self._settle()
\ No newline at end of file
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import argparse
+from config import load_config
+from remote import send_commands
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="wmus-remote",
+        description="Control a running wmus. Commands run in the order given."
+    )
+    parser.add_argument("--socket", help="control socket or pipe (default: from config)")
+    parser.add_argument("-p", "--play", dest="commands", action="append_const", const="play", help="start or resume playback")
+    parser.add_argument("-u", "--pause", dest="commands", action="append_const", const="toggle", help="toggle pause")
+    parser.add_argument("-n", "--next", dest="commands", action="append_const", const="next", help="skip to the next track")
+    parser.add_argument("-r", "--prev", dest="commands", action="append_const", const="prev", help="go to the previous track")
+    parser.add_argument("-S", "--shuffle", dest="commands", action="append_const", const="shuffle", help="toggle shuffle")
+    parser.add_argument("-R", "--repeat", dest="commands", action="append_const", const="repeat", help="toggle repeat")
+    parser.add_argument("-k", "--seek", dest="commands", action="append", type=lambda v: f"seek {v}",
+                        metavar="SECONDS", help="seek to SECONDS, or by +SECONDS/-SECONDS")
+    parser.add_argument("-v", "--volume", dest="commands", action="append", type=lambda v: f"volume {v}",
+                        metavar="PERCENT", help="set volume to PERCENT, or change it by +PERCENT/-PERCENT")
+    parser.add_argument("-q", "--enqueue", dest="commands", action="append", type=lambda v: f"enqueue {os.path.abspath(v)}",
+                        metavar="PATH", help="add a file or folder from the library to the queue")
+    parser.add_argument("-C", "--raw", dest="commands", action="append", metavar="COMMAND",
+                        help="run a wmus command such as ':refresh'")
+    parser.add_argument("-Q", "--status", dest="commands", action="append_const", const="status", help="print player status as JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.commands:
+        args.commands = ["status"]
+    
+    address = args.socket or load_config().get("remote_address") or None
+    try:
+        reply = send_commands(args.commands, address)
+    except (OSError, EOFError):
+        sys.exit("wmus is not running (or remote control is disabled)")
+    
+    if "error" in reply:
+        sys.exit(reply["error"])
+    
+    failed = False
+    for result in reply["results"]:
+        if not result["ok"]:
+            print(f"{result['command']}: {result['message']}", file=sys.stderr)
+            failed = True
+    if "status" in args.commands:
+        print(json.dumps(reply["status"], indent=2))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file